@@ -1,7 +1,15 @@
+import json
+import logging
 import os
+import queue
+import sys
 import tempfile
+import time
 import uuid
-from fastapi import FastAPI, UploadFile, File, HTTPException, Body
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from fastapi import FastAPI, UploadFile, File, HTTPException, Body, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from faster_whisper import WhisperModel
@@ -12,6 +20,57 @@ ASR_MODEL_PATH = os.getenv("ASR_MODEL_PATH", "/app/models/whisper-small-ct2")
 XTTS_MODEL_DIR = os.getenv("XTTS_MODEL_DIR", "/app/xtts")
 XTTS_SPEAKER_WAV = os.getenv("XTTS_SPEAKER_WAV", "")
 XTTS_LANGUAGE = os.getenv("XTTS_LANGUAGE", "")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+# Logging: JSON lines written by a background thread; handlers only enqueue,
+# and drop records when the queue is full, so requests never wait on stdout.
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "request_id"}
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        entry.update((k, v) for k, v in vars(record).items() if k not in _RECORD_ATTRS)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class _NonBlockingQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.request_id = request_id_var.get()
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+def _setup_logging() -> QueueListener:
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(_JsonFormatter())
+    handler = _NonBlockingQueueHandler(queue.Queue(maxsize=10000))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL.upper())
+    listener = QueueListener(handler.queue, output)
+    listener.start()
+    return listener
+
+_log_listener = _setup_logging()
+logger = logging.getLogger("asr_tts")
 
 app = FastAPI(title="PuoSpeech AI Backend")
 
@@ -26,7 +85,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    request_id_var.set(request_id)
+    started = time.perf_counter()
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    logger.info(
+        "%s %s %s", request.method, request.url.path, response.status_code,
+        extra={"duration_ms": round((time.perf_counter() - started) * 1000, 1)},
+    )
+    return response
+
+@app.on_event("shutdown")
+def _stop_logging() -> None:
+    _log_listener.stop()
+
 model = WhisperModel(ASR_MODEL_PATH, device="cpu", compute_type="int8")
+logger.info("ASR model loaded", extra={"model_path": ASR_MODEL_PATH})
 
 def _cleanup(path: str) -> None:
     if os.path.exists(path):
@@ -42,6 +119,7 @@ def _load_tts() -> TTS | None:
     return TTS(model_path=model_path, config_path=config_path, progress_bar=False, gpu=False)
 
 tts_model = _load_tts()
+logger.info("TTS model %s", "loaded" if tts_model is not None else "not configured", extra={"model_dir": XTTS_MODEL_DIR})
 
 @app.get("/health")
 def health():
@@ -59,6 +137,7 @@ async def transcribe_speech(user_audio: UploadFile = File(...)):
         text = " ".join([s.text for s in segments]).strip()
         return {"transcription": text, "filename": user_audio.filename, "status": "success"}
     except Exception as e:
+        logger.exception("ASR failed")
         raise HTTPException(status_code=500, detail=f"ASR failed: {e}")
     finally:
         if os.path.exists(tmp_path):
@@ -75,6 +154,7 @@ async def translate_speech(user_audio: UploadFile = File(...)):
         text = " ".join([s.text for s in segments]).strip()
         return {"translation": text, "filename": user_audio.filename}
     except Exception as e:
+        logger.exception("Translate failed")
         raise HTTPException(status_code=500, detail=f"Translate failed: {e}")
     finally:
         if os.path.exists(tmp_path):
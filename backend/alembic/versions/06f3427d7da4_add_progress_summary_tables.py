@@ -0,0 +1,62 @@
+"""add_progress_summary_tables
+
+Revision ID: 06f3427d7da4
+Revises: fc1837157989
+Create Date: 2026-10-18 09:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '06f3427d7da4'
+down_revision: Union[str, None] = 'fc1837157989'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_unit_progress',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('unit_id', sa.Integer(), sa.ForeignKey('units.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('completed_lessons', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('user_id', 'unit_id')
+    )
+
+    op.create_table(
+        'user_course_progress',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('course_id', sa.Integer(), sa.ForeignKey('courses.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('completed_lessons', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('user_id', 'course_id')
+    )
+
+    # Backfill from existing progress; duplicate progress rows count once.
+    op.execute(
+        """
+        INSERT INTO user_unit_progress (user_id, unit_id, completed_lessons)
+        SELECT p.user_id, l.unit_id, count(DISTINCT p.lesson_id)
+        FROM user_progress p
+        JOIN lessons l ON l.id = p.lesson_id
+        WHERE p.completed
+        GROUP BY p.user_id, l.unit_id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO user_course_progress (user_id, course_id, completed_lessons)
+        SELECT up.user_id, u.course_id, sum(up.completed_lessons)
+        FROM user_unit_progress up
+        JOIN units u ON u.id = up.unit_id
+        GROUP BY up.user_id, u.course_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_course_progress')
+    op.drop_table('user_unit_progress')
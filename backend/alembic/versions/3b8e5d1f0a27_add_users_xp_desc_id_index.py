@@ -0,0 +1,29 @@
+"""add_users_xp_desc_id_index
+
+Revision ID: 3b8e5d1f0a27
+Revises: c90783e6c169
+Create Date: 2026-10-18 14:02:17.551203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e5d1f0a27'
+down_revision: Union[str, None] = 'c90783e6c169'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_xp_desc_id', 'users', [sa.text('xp DESC'), 'id'])
+    # Leading xp column makes the single-column index redundant
+    op.drop_index('ix_users_xp', table_name='users')
+
+
+def downgrade() -> None:
+    op.create_index('ix_users_xp', 'users', ['xp'])
+    op.drop_index('ix_users_xp_desc_id', table_name='users')
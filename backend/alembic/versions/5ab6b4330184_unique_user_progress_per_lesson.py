@@ -0,0 +1,53 @@
+"""unique_user_progress_per_lesson
+
+Revision ID: 5ab6b4330184
+Revises: 06f3427d7da4
+Create Date: 2026-10-18 10:03:17.552904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5ab6b4330184'
+down_revision: Union[str, None] = '06f3427d7da4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Collapse duplicate rows left by concurrent completions: the surviving
+    # (newest) row keeps the completion if any duplicate had it.
+    op.execute(
+        """
+        UPDATE user_progress p
+        SET completed = true
+        FROM user_progress d
+        WHERE d.user_id = p.user_id
+          AND d.lesson_id = p.lesson_id
+          AND d.completed
+          AND NOT coalesce(p.completed, false)
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM user_progress p
+        USING user_progress d
+        WHERE d.user_id = p.user_id
+          AND d.lesson_id = p.lesson_id
+          AND d.id > p.id
+        """
+    )
+
+    # The constraint's unique index on (user_id, lesson_id) backs the
+    # ON CONFLICT target and also serves per-user progress lookups.
+    op.create_unique_constraint(
+        'uq_user_progress_user_id_lesson_id', 'user_progress', ['user_id', 'lesson_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_user_progress_user_id_lesson_id', 'user_progress', type_='unique')
@@ -0,0 +1,31 @@
+"""add_users_token_version_index
+
+Revision ID: 5e1a9c3d7b48
+Revises: 9d41c2e7b6f3
+Create Date: 2026-10-18 18:21:40.412907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1a9c3d7b48'
+down_revision: Union[str, None] = '9d41c2e7b6f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_users_token_version',
+        'users',
+        ['id', 'token_version'],
+        postgresql_where=sa.text('token_version > 0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_token_version', table_name='users')
@@ -0,0 +1,66 @@
+"""add_xp_ledger_and_rollups
+
+Revision ID: 9d41c2e7b6f3
+Revises: 3b8e5d1f0a27
+Create Date: 2026-10-18 15:21:48.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d41c2e7b6f3'
+down_revision: Union[str, None] = '3b8e5d1f0a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'xp_events',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_xp_events_user_id', 'xp_events', ['user_id'])
+
+    op.create_table(
+        'user_xp_daily',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('xp', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'day'),
+    )
+    op.create_index(
+        'ix_user_xp_daily_day_xp_desc_user_id', 'user_xp_daily', ['day', sa.text('xp DESC'), 'user_id']
+    )
+
+    op.create_table(
+        'user_xp_weekly',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('xp', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'week_start'),
+    )
+    op.create_index(
+        'ix_user_xp_weekly_week_start_xp_desc_user_id',
+        'user_xp_weekly',
+        ['week_start', sa.text('xp DESC'), 'user_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_xp_weekly_week_start_xp_desc_user_id', table_name='user_xp_weekly')
+    op.drop_table('user_xp_weekly')
+    op.drop_index('ix_user_xp_daily_day_xp_desc_user_id', table_name='user_xp_daily')
+    op.drop_table('user_xp_daily')
+    op.drop_index('ix_xp_events_user_id', table_name='xp_events')
+    op.drop_table('xp_events')
@@ -0,0 +1,29 @@
+"""add_user_token_version
+
+Revision ID: c90783e6c169
+Revises: f7bd28da9445
+Create Date: 2026-10-18 12:04:41.318560
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c90783e6c169'
+down_revision: Union[str, None] = 'f7bd28da9445'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,38 @@
+"""add_foreign_key_indexes
+
+Revision ID: f7bd28da9445
+Revises: 5ab6b4330184
+Create Date: 2026-10-18 11:26:05.914372
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7bd28da9445'
+down_revision: Union[str, None] = '5ab6b4330184'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_units_course_id', 'units', ['course_id'])
+    op.create_index('ix_lessons_unit_id', 'lessons', ['unit_id'])
+    op.create_index('ix_challenges_lesson_id', 'challenges', ['lesson_id'])
+    op.create_index('ix_challenge_options_challenge_id', 'challenge_options', ['challenge_id'])
+    op.create_index('ix_user_quests_user_id', 'user_quests', ['user_id'])
+    op.create_index('ix_users_xp', 'users', ['xp'])
+    # user_progress.user_id is already the leading column of
+    # uq_user_progress_user_id_lesson_id, so it needs no index of its own.
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_xp', table_name='users')
+    op.drop_index('ix_user_quests_user_id', table_name='user_quests')
+    op.drop_index('ix_challenge_options_challenge_id', table_name='challenge_options')
+    op.drop_index('ix_challenges_lesson_id', table_name='challenges')
+    op.drop_index('ix_lessons_unit_id', table_name='lessons')
+    op.drop_index('ix_units_course_id', table_name='units')
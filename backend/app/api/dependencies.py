@@ -1,14 +1,19 @@
+import time
 from typing import Generator, Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
+from app.core.log import get_logger
+from app.core.security import decode_token
 from app.db.database import get_db
 from app.models.user import User
-from app.schemas.user import TokenPayload
-from app.services.user_service import UserService
+from app.schemas.user import Principal, TokenPayload
+from app.services.user_cache import user_cache
+
+logger = get_logger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
@@ -16,23 +21,17 @@ async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: Annotated[AsyncSession, Depends(get_db)]
 ) -> User:
-    print(f"DEBUG: get_current_user: received token (start): {token[:10]}...")
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        token_data = TokenPayload(**payload)
-        print(f"DEBUG: get_current_user: token decoded successfully for sub: {token_data.sub}")
+        token_data = decode_token(token)
+        logger.debug("Token decoded for sub %s", token_data.sub)
     except (JWTError, ValidationError) as e:
-        print(f"DEBUG: get_current_user: JWT error: {str(e)}")
+        logger.debug("Rejected access token: %s", e)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
     
-    user_service = UserService(db)
-    user = await user_service.get_user(int(token_data.sub))
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    user = await user_service.get_user(int(token_data.sub))
+    user = await user_cache.get_user(db, int(token_data.sub))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -46,21 +45,85 @@ async def get_current_user_optional(
     if not token:
         return None
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        token_data = TokenPayload(**payload)
+        token_data = decode_token(token)
     except (JWTError, ValidationError):
         return None
     
-    user_service = UserService(db)
-    user = await user_service.get_user(int(token_data.sub))
+    user = await user_cache.get_user(db, int(token_data.sub))
     return user
  
 
 
+def _principal_from_claims(token_data: TokenPayload) -> Principal | None:
+    """Principal from the token's signed claims, if enabled, present and still fresh."""
+    if not settings.ACCESS_TOKEN_CLAIMS or token_data.adm is None or token_data.cexp is None:
+        return None
+    if token_data.cexp <= time.time():
+        return None
+    user_id = int(token_data.sub)
+    # Minted before a role change; versions are synced from the users table
+    if (token_data.ver or 0) < user_cache.token_version(user_id):
+        return None
+    return Principal(id=user_id, is_admin=token_data.adm)
+
+
+async def _resolve_principal(token_data: TokenPayload, db: AsyncSession) -> Principal | None:
+    if settings.ACCESS_TOKEN_CLAIMS and token_data.ver is not None:
+        await user_cache.sync_token_versions(db)
+    principal = _principal_from_claims(token_data)
+    if principal is not None:
+        return principal
+    user = await user_cache.get_user(db, int(token_data.sub))
+    if not user:
+        return None
+    return Principal(id=user.id, is_admin=user.is_admin)
+
+
+async def get_current_principal(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: Annotated[AsyncSession, Depends(get_db)]
+) -> Principal:
+    """Like ``get_current_user`` for endpoints that only need identity or role.
+
+    With ``ACCESS_TOKEN_CLAIMS`` enabled this usually needs no database access.
+    """
+    try:
+        token_data = decode_token(token)
+    except (JWTError, ValidationError):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
+
+    principal = await _resolve_principal(token_data, db)
+    if not principal:
+        raise HTTPException(status_code=404, detail="User not found")
+    return principal
+
+
+async def get_current_principal_optional(
+    token: Annotated[str | None, Depends(oauth2_scheme_optional)],
+    db: Annotated[AsyncSession, Depends(get_db)]
+) -> Principal | None:
+    if not token:
+        return None
+    try:
+        token_data = decode_token(token)
+    except (JWTError, ValidationError):
+        return None
+
+    return await _resolve_principal(token_data, db)
+
+
 async def get_current_admin_user(
-    current_user: Annotated[User, Depends(get_current_user)]
-) -> User:
-    """Dependency to ensure current user is an admin."""
+    current_user: Annotated[Principal, Depends(get_current_principal)]
+) -> Principal:
+    """Dependency to ensure current user is an admin.
+
+    With ``ACCESS_TOKEN_CLAIMS`` the role comes from the token. Revoking admin
+    bumps ``token_version``, which every worker picks up within
+    ``TOKEN_VERSION_REFRESH_SECONDS``, after which the old claims are ignored.
+    """
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -2,9 +2,9 @@ from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import dependencies
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.user import User
-from app.schemas.user import User as UserSchema
+from app.schemas.user import Principal, User as UserSchema
 from app.services.user_service import UserService
 from sqlalchemy import select, func
 from app.models.course import Course, Unit, Lesson, Challenge
@@ -13,7 +13,7 @@ router = APIRouter()
 
 @router.get("/users", response_model=List[UserSchema])
 async def list_all_users(
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
@@ -26,7 +26,7 @@ async def list_all_users(
 @router.post("/users/{user_id}/make-admin")
 async def make_user_admin(
     user_id: int,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Grant admin privileges to a user."""
@@ -35,16 +35,13 @@ async def make_user_admin(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    user.is_admin = True
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
+    await user_service.set_admin(user, True)
     return {"message": f"User {user.email} is now an admin"}
 
 @router.delete("/users/{user_id}/remove-admin")
 async def remove_user_admin(
     user_id: int,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Revoke admin privileges from a user."""
@@ -57,15 +54,12 @@ async def remove_user_admin(
     if user.id == current_admin.id:
         raise HTTPException(status_code=400, detail="Cannot remove admin privileges from yourself")
     
-    user.is_admin = False
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
+    await user_service.set_admin(user, False)
     return {"message": f"Admin privileges removed from {user.email}"}
 @router.get("/analytics")
 async def get_analytics(
-    current_admin: User = Depends(dependencies.get_current_admin_user),
-    db: AsyncSession = Depends(get_db),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> Any:
     """Admin only: Get platform-wide analytics."""
     # Counts
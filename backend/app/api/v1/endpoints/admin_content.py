@@ -7,7 +7,7 @@ from app.api import dependencies
 from app.db.database import get_db
 from app.core.config import settings
 from app.core.runtime import local_uploads_supported
-from app.models.user import User
+from app.schemas.user import Principal
 from app.schemas.course import Course, Unit, Lesson, Challenge, ChallengeOption
 from app.schemas.admin_content import (
     CourseCreate, CourseUpdate,
@@ -25,7 +25,7 @@ router = APIRouter()
 @router.post("/upload")
 async def upload_media(
     file: UploadFile = File(...),
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
 ) -> Any:
     """Admin only: Upload an image or audio file."""
     # Check file extension
@@ -62,7 +62,7 @@ async def upload_media(
 @router.post("/courses", response_model=Course)
 async def create_course(
     course_in: CourseCreate,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Create a new course."""
@@ -73,7 +73,7 @@ async def create_course(
 async def update_course(
     course_id: int,
     course_in: CourseUpdate,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Update a course."""
@@ -86,7 +86,7 @@ async def update_course(
 @router.delete("/courses/{course_id}")
 async def delete_course(
     course_id: int,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Delete a course."""
@@ -101,7 +101,7 @@ async def delete_course(
 @router.post("/units", response_model=Unit)
 async def create_unit(
     unit_in: UnitCreate,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Create a new unit."""
@@ -112,7 +112,7 @@ async def create_unit(
 async def update_unit(
     unit_id: int,
     unit_in: UnitUpdate,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Update a unit."""
@@ -125,7 +125,7 @@ async def update_unit(
 @router.delete("/units/{unit_id}")
 async def delete_unit(
     unit_id: int,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Delete a unit."""
@@ -140,7 +140,7 @@ async def delete_unit(
 @router.post("/lessons", response_model=Lesson)
 async def create_lesson(
     lesson_in: LessonCreate,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Create a new lesson."""
@@ -151,7 +151,7 @@ async def create_lesson(
 async def update_lesson(
     lesson_id: int,
     lesson_in: LessonUpdate,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Update a lesson."""
@@ -164,7 +164,7 @@ async def update_lesson(
 @router.delete("/lessons/{lesson_id}")
 async def delete_lesson(
     lesson_id: int,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Delete a lesson."""
@@ -179,7 +179,7 @@ async def delete_lesson(
 @router.post("/challenges", response_model=Challenge)
 async def create_challenge(
     challenge_in: ChallengeCreate,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Create a new challenge."""
@@ -190,7 +190,7 @@ async def create_challenge(
 async def update_challenge(
     challenge_id: int,
     challenge_in: ChallengeUpdate,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Update a challenge."""
@@ -203,7 +203,7 @@ async def update_challenge(
 @router.delete("/challenges/{challenge_id}")
 async def delete_challenge(
     challenge_id: int,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Delete a challenge."""
@@ -219,7 +219,7 @@ async def delete_challenge(
 async def create_challenge_option(
     challenge_id: int,
     option_in: ChallengeOptionCreate,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Create a new challenge option."""
@@ -230,7 +230,7 @@ async def create_challenge_option(
 async def update_challenge_option(
     option_id: int,
     option_in: ChallengeOptionUpdate,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Update a challenge option."""
@@ -243,7 +243,7 @@ async def update_challenge_option(
 @router.delete("/options/{option_id}")
 async def delete_challenge_option(
     option_id: int,
-    current_admin: User = Depends(dependencies.get_current_admin_user),
+    current_admin: Principal = Depends(dependencies.get_current_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Admin only: Delete a challenge option."""
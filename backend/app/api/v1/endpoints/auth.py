@@ -5,14 +5,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from authlib.integrations.starlette_client import OAuth
 from app.api import dependencies
 from app.core.config import settings
-from app.core.security import create_access_token, create_refresh_token
+from app.core.http_client import get_http_client
+from app.core.jwks import firebase_jwks
+from app.core.log import get_logger
+from app.core.security import create_access_token, create_refresh_token, decode_token, user_token_claims
 from app.db.database import get_db
 from app.schemas.user import Token, UserCreate, User, FirebaseLoginRequest, RefreshTokenRequest
-import httpx
 from jose import jwt
 from app.services.auth_service import AuthService
+from app.services.user_service import UserService
 
 router = APIRouter()
+logger = get_logger(__name__)
 
 @router.post("/register", response_model=User)
 async def register(
@@ -36,7 +40,7 @@ async def login(
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = create_access_token(subject=user.id)
+    access_token = create_access_token(subject=user.id, claims=user_token_claims(user))
     refresh_token = create_refresh_token(subject=user.id)
     return {
         "access_token": access_token, 
@@ -50,62 +54,60 @@ async def refresh_token_endpoint(
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """Refresh access token using a valid refresh token."""
-    from jose import jwt, JWTError
+    from jose import JWTError
+    from pydantic import ValidationError
     try:
-        payload = jwt.decode(request.refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id = payload.get("sub")
-        if not user_id or not payload.get("refresh"):
+        token_data = decode_token(request.refresh_token)
+        user_id = token_data.sub
+        if not user_id or not token_data.refresh:
             raise HTTPException(status_code=401, detail="Invalid refresh token")
         
+        # Claims are re-minted from the current row, so refreshing picks up role changes
+        claims = {}
+        if settings.ACCESS_TOKEN_CLAIMS:
+            user = await UserService(db).get_user(int(user_id))
+            if not user:
+                raise HTTPException(status_code=401, detail="Invalid refresh token")
+            claims = user_token_claims(user)
+
         # Generate new tokens
-        access_token = create_access_token(subject=user_id)
+        access_token = create_access_token(subject=user_id, claims=claims)
         new_refresh_token = create_refresh_token(subject=user_id)
         return {
             "access_token": access_token,
             "token_type": "bearer",
             "refresh_token": new_refresh_token
         }
-    except JWTError:
+    except (JWTError, ValidationError):
         raise HTTPException(status_code=401, detail="Invalid refresh token")
 
 async def verify_firebase_token(token: str):
     # Using python-jose which is already in the project and works well with RS256/JWKS
     from jose import jwt, JWTError
-    import httpx
     
-    print(f"DEBUG: Starting Firebase token verification. Project ID: '{settings.FIREBASE_PROJECT_ID}'")
+    logger.debug("Verifying Firebase token for project %r", settings.FIREBASE_PROJECT_ID)
     
     if not settings.FIREBASE_PROJECT_ID:
-        print("ERROR: FIREBASE_PROJECT_ID is not set in environment variables!")
+        logger.error("FIREBASE_PROJECT_ID is not set in environment variables")
         raise HTTPException(
             status_code=400, 
             detail="Server configuration error: FIREBASE_PROJECT_ID is missing on the server. Please check ECS environment variables."
         )
 
-    jwks_url = "https://www.googleapis.com/service_accounts/v1/jwk/securetoken@system.gserviceaccount.com"
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(jwks_url)
-            jwks = response.json()
-    except Exception as e:
-        print(f"ERROR: Failed to fetch JWKS: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to fetch Firebase public keys")
-    
     try:
         unverified_header = jwt.get_unverified_header(token)
         kid = unverified_header.get('kid')
         if not kid:
             raise HTTPException(status_code=401, detail="Missing 'kid' in token header")
-            
-        # Find the correct key in JWKS
-        key = None
-        for k in jwks.get('keys', []):
-            if k.get('kid') == kid:
-                key = k
-                break
-        
+
+        try:
+            key = await firebase_jwks.get_key(kid)
+        except Exception as e:
+            logger.error("Failed to fetch Firebase JWKS: %s", e)
+            raise HTTPException(status_code=500, detail="Failed to fetch Firebase public keys")
+
         if not key:
-            print(f"ERROR: No matching key found for kid: {kid}")
+            logger.warning("No Firebase signing key for kid %s", kid)
             raise HTTPException(status_code=401, detail=f"No matching key found for kid: {kid}")
 
         # Verify the token
@@ -116,16 +118,18 @@ async def verify_firebase_token(token: str):
             audience=settings.FIREBASE_PROJECT_ID,
             issuer=f"https://securetoken.google.com/{settings.FIREBASE_PROJECT_ID}"
         )
-        print(f"DEBUG: Token verified successfully for user: {payload.get('email')}")
+        logger.debug("Firebase token verified for uid %s", payload.get('sub'))
         return payload
+    except HTTPException:
+        raise
     except JWTError as e:
-        print(f"ERROR: Token verification failed: {str(e)}")
+        logger.info("Firebase token rejected: %s", e)
         raise HTTPException(
             status_code=401, 
             detail=f"Token verification failed: {str(e)}. (Project: {settings.FIREBASE_PROJECT_ID})"
         )
     except Exception as e:
-        print(f"ERROR: Unexpected verification error: {str(e)}")
+        logger.exception("Unexpected Firebase token verification error")
         raise HTTPException(
             status_code=401, 
             detail=f"Unexpected error during token verification: {str(e)}"
@@ -155,7 +159,7 @@ async def firebase_login(
             image_src=picture
         )
         
-        access_token = create_access_token(subject=user.id)
+        access_token = create_access_token(subject=user.id, claims=user_token_claims(user))
         refresh_token = create_refresh_token(subject=user.id)
         
         return {
@@ -166,9 +170,7 @@ async def firebase_login(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"ERROR: Unexpected error in firebase_login: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Unexpected error in firebase_login")
         raise HTTPException(status_code=500, detail=f"Internal Server Error in login: {str(e)}")
 
 @router.get("/debug-config")
@@ -183,13 +185,11 @@ async def debug_config(db: AsyncSession = Depends(get_db)):
     except Exception as e:
         db_error = str(e)
 
-    import httpx
     internet_ok = False
     internet_error = None
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get("https://www.google.com", timeout=2.0)
-            internet_ok = resp.status_code == 200
+        resp = await get_http_client().get("https://www.google.com", timeout=2.0)
+        internet_ok = resp.status_code == 200
     except Exception as e:
         internet_error = str(e)
 
@@ -1,50 +1,136 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.database import get_db
+from app.core.config import settings
+from app.core.http_cache import EncodedResponseCache, cached_json_response
+from app.db.database import get_db, get_read_db
 from app.schemas.course import Course as CourseSchema
 from app.schemas.course import Unit as UnitSchema
 from app.services.course_service import CourseService
+from app.services.curriculum_cache import CourseNode, curriculum_cache, encode_nodes
 
 router = APIRouter()
 
 from app.schemas.course import Course as CourseSchema, CourseList as CourseListSchema
-from app.api.dependencies import get_current_user_optional
-from app.models.user import User
+from app.api.dependencies import get_current_principal_optional
+from app.schemas.user import Principal
 from typing import Optional
 
+# Encoded payloads per curriculum version. Personalised responses are keyed by
+# their lock/completion flags, which many learners share.
+_responses = EncodedResponseCache(max_entries=1024)
+_course_adapter = TypeAdapter(CourseSchema)
+_courses_adapter = TypeAdapter(List[CourseSchema])
+_units_adapter = TypeAdapter(List[UnitSchema])
+_VARY = {"Vary": "Authorization"}
+
+
+def _course_progress_key(course: CourseNode) -> tuple:
+    return tuple(
+        (unit.locked, unit.completed, tuple(lesson.completed for lesson in unit.lessons))
+        for unit in course.units
+    )
+
+
 @router.get("/", response_model=List[CourseSchema])
 async def read_courses(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_read_db),
+    current_user: Optional[Principal] = Depends(get_current_principal_optional),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+) -> Any:
+    course_service = CourseService(db, read_db)
+    version = curriculum_cache.version
+
+    if not current_user:
+        async def build_anonymous() -> bytes:
+            courses = await course_service.get_courses()
+            return encode_nodes(_courses_adapter, courses[skip:skip + limit])
+
+        return await cached_json_response(
+            request, _responses, version, ("courses", skip, limit), build_anonymous, _VARY
+        )
+
+    # Lock state depends on earlier courses, so paginate after the overlay
+    courses = (await course_service.get_courses(current_user.id))[skip:skip + limit]
+    key = ("courses", skip, limit, tuple((course.locked, course.completed) for course in courses))
+
+    async def build() -> bytes:
+        return encode_nodes(_courses_adapter, courses)
+
+    return await cached_json_response(request, _responses, version, key, build, _VARY)
+
+
+@router.get("/catalog", response_model=List[CourseListSchema])
+async def read_course_catalog(
     db: AsyncSession = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user_optional),
-    skip: int = 0,
-    limit: int = 100,
+    read_db: AsyncSession = Depends(get_read_db),
+    current_user: Optional[Principal] = Depends(get_current_principal_optional),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
 ) -> Any:
-    course_service = CourseService(db)
+    """Flat course listing for the home screen, without units or lessons."""
+    course_service = CourseService(db, read_db)
     user_id = current_user.id if current_user else None
-    return await course_service.get_courses(user_id)
+    return await course_service.get_course_catalog(user_id, skip=skip, limit=limit)
 
 
 @router.get("/{course_id}", response_model=CourseSchema)
 async def read_course(
     course_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user_optional),
+    read_db: AsyncSession = Depends(get_read_db),
+    current_user: Optional[Principal] = Depends(get_current_principal_optional),
 ) -> Any:
-    course_service = CourseService(db)
-    user_id = current_user.id if current_user else None
-    course = await course_service.get_course_with_progress(course_id, user_id)
-    if not course:
+    course_service = CourseService(db, read_db)
+    version = curriculum_cache.version
+
+    if not current_user:
+        async def build_anonymous() -> bytes | None:
+            if settings.COURSE_JSON_AGGREGATION:
+                return await course_service.get_course_json(course_id)
+            course = await course_service.get_course(course_id)
+            return encode_nodes(_course_adapter, course) if course else None
+
+        response = await cached_json_response(
+            request, _responses, version, ("course", course_id), build_anonymous, _VARY
+        )
+    else:
+        course = await course_service.get_course_with_progress(course_id, current_user.id)
+        if not course:
+            raise HTTPException(status_code=404, detail="Course not found")
+
+        async def build() -> bytes:
+            return encode_nodes(_course_adapter, course)
+
+        key = ("course", course_id, _course_progress_key(course))
+        response = await cached_json_response(request, _responses, version, key, build, _VARY)
+
+    if response is None:
         raise HTTPException(status_code=404, detail="Course not found")
-    return course
+    return response
 
 @router.get("/{course_id}/units", response_model=List[UnitSchema])
 async def read_course_units(
     course_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    read_db: AsyncSession = Depends(get_read_db),
 ) -> Any:
-    course_service = CourseService(db)
-    course = await course_service.get_course(course_id)
-    if not course:
+    course_service = CourseService(read_db)
+
+    async def build() -> bytes | None:
+        if settings.COURSE_JSON_AGGREGATION:
+            return await course_service.get_course_units_json(course_id)
+        course = await course_service.get_course(course_id)
+        return encode_nodes(_units_adapter, course.units) if course else None
+
+    response = await cached_json_response(
+        request, _responses, curriculum_cache.version, ("units", course_id), build
+    )
+    if response is None:
         raise HTTPException(status_code=404, detail="Course not found")
-    return course.units
+    return response
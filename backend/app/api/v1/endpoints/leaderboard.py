@@ -1,23 +1,192 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import and_, func, or_, select, union_all
+from sqlalchemy.orm import aliased
 from app.api import dependencies
-from app.db.database import get_db
+from app.core.config import settings
+from app.db.database import get_read_db
 from app.models.user import User
-from app.schemas.user import User as UserSchema
+from app.models.xp import UserXpDaily, UserXpWeekly
+from app.schemas.leaderboard import (
+    LeaderboardEntry,
+    LeaderboardNeighbourhood,
+    LeaderboardRank,
+    RankedLeaderboardEntry,
+)
+from app.schemas.user import Principal
+from app.services.leaderboard import leaderboard
+from app.services.xp_ledger_service import week_start
 
 router = APIRouter()
 
-@router.get("/", response_model=List[UserSchema])
+_PROFILE_COLUMNS = (User.id, User.full_name, User.image_src)
+_ENTRY_COLUMNS = _PROFILE_COLUMNS + (User.xp,)
+
+
+def _parse_cursor(after: str) -> Tuple[int, int]:
+    try:
+        xp, user_id = (int(part) for part in after.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor, expected 'xp,id'")
+    return xp, user_id
+
+
+@router.get("/", response_model=List[LeaderboardEntry])
 async def get_leaderboard(
-    current_user: User = Depends(dependencies.get_current_user_optional),
-    db: AsyncSession = Depends(get_db),
-    limit: int = 10,
+    current_user: Optional[Principal] = Depends(dependencies.get_current_principal_optional),
+    db: AsyncSession = Depends(get_read_db),
+    limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = Query(None, description="Cursor from the last entry of the previous page: 'xp,id'"),
 ) -> Any:
-    result = await db.execute(
-        select(User)
-        .order_by(User.xp.desc())
+    cursor = _parse_cursor(after) if after else None
+
+    if not settings.LEADERBOARD_IN_MEMORY:
+        stmt = select(*_ENTRY_COLUMNS).order_by(User.xp.desc(), User.id).limit(limit)
+        if cursor:
+            xp, user_id = cursor
+            # The redundant xp <= bound lets the index scan start at the cursor
+            stmt = stmt.where(User.xp <= xp, or_(User.xp < xp, User.id > user_id))
+        result = await db.execute(stmt)
+        return [LeaderboardEntry.model_validate(row) for row in result]
+
+    await leaderboard.ensure_loaded()
+    ranked = leaderboard.after(*cursor, limit) if cursor else leaderboard.top(limit)
+    # XP comes from the snapshot that produced the order, profiles from the table
+    result = await db.execute(select(*_PROFILE_COLUMNS).where(User.id.in_([user_id for user_id, _ in ranked])))
+    rows_by_id = {row.id: row for row in result}
+    return [
+        LeaderboardEntry(**rows_by_id[user_id]._mapping, xp=xp)
+        for user_id, xp in ranked
+        if user_id in rows_by_id
+    ]
+
+async def _period_leaderboard(db: AsyncSession, totals, period_filter, limit: int, after: Optional[str]) -> List[LeaderboardEntry]:
+    """Top XP gainers within one rollup period, keyset-paginated like the lifetime board."""
+    stmt = (
+        select(User.id, User.full_name, User.image_src, totals.xp)
+        .join(User, User.id == totals.user_id)
+        .where(period_filter)
+        .order_by(totals.xp.desc(), totals.user_id)
         .limit(limit)
     )
-    return result.scalars().all()
+    if after:
+        xp, user_id = _parse_cursor(after)
+        stmt = stmt.where(totals.xp <= xp, or_(totals.xp < xp, totals.user_id > user_id))
+    result = await db.execute(stmt)
+    return [LeaderboardEntry.model_validate(row) for row in result]
+
+@router.get("/daily", response_model=List[LeaderboardEntry])
+async def get_daily_leaderboard(
+    db: AsyncSession = Depends(get_read_db),
+    limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = Query(None, description="Cursor from the last entry of the previous page: 'xp,id'"),
+) -> Any:
+    """XP gained today (UTC)."""
+    today = datetime.utcnow().date()
+    return await _period_leaderboard(db, UserXpDaily, UserXpDaily.day == today, limit, after)
+
+@router.get("/weekly", response_model=List[LeaderboardEntry])
+async def get_weekly_leaderboard(
+    db: AsyncSession = Depends(get_read_db),
+    limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = Query(None, description="Cursor from the last entry of the previous page: 'xp,id'"),
+) -> Any:
+    """XP gained this week (UTC, starting Monday)."""
+    this_week = week_start(datetime.utcnow().date())
+    return await _period_leaderboard(db, UserXpWeekly, UserXpWeekly.week_start == this_week, limit, after)
+
+def _neighbourhood_statement(user_id: int, k: int):
+    """The user plus up to ``k`` users on each side, with their ranks, in one statement.
+
+    Neighbours are two keyset scans of ix_users_xp_desc_id from the user's
+    position (one backwards), so they cost O(k). ``row_number()`` numbers the
+    2k + 1 rows, offset by the count of users ahead. That count is an index-only
+    scan over every user ranked above, O(rank) rather than O(k), so
+    ``LEADERBOARD_IN_MEMORY``, which takes the rank from ``RankedKeys``, is
+    preferred for large boards. check_query_plans keeps the count index-only.
+    """
+    # Scalar subqueries rather than a joined CTE, so the user's (xp, id) become
+    # index bounds for the neighbour scans
+    me = aliased(User)
+    my_xp = select(me.xp).where(me.id == user_id).scalar_subquery()
+    ahead_of_me = and_(User.xp >= my_xp, or_(User.xp > my_xp, User.id < user_id))
+    behind_me = and_(User.xp <= my_xp, or_(User.xp < my_xp, User.id > user_id))
+
+    above = select(User.id, User.xp).where(ahead_of_me).order_by(User.xp, User.id.desc()).limit(k).cte("above")
+    below = select(User.id, User.xp).where(behind_me).order_by(User.xp.desc(), User.id).limit(k).cte("below")
+    mine = select(User.id, User.xp).where(User.id == user_id)
+    hood = union_all(select(above), mine, select(below)).subquery("hood")
+
+    # correlate(None): the outer query also selects from users
+    users_ahead = select(func.count()).select_from(User).where(ahead_of_me).correlate(None).scalar_subquery()
+    shown_ahead = select(func.count()).select_from(above).correlate(None).scalar_subquery()
+    rank = users_ahead - shown_ahead + func.row_number().over(order_by=(hood.c.xp.desc(), hood.c.id))
+    return (
+        select(User.id, User.full_name, User.image_src, User.xp, rank.label("rank"))
+        .join_from(hood, User, User.id == hood.c.id)
+        .order_by(hood.c.xp.desc(), hood.c.id)
+    )
+
+async def _ensure_ranked(db: AsyncSession, user_id: int) -> None:
+    """Load the in-memory ranking and make sure it includes ``user_id``."""
+    await leaderboard.ensure_loaded()
+    if leaderboard.rank(user_id) is None:
+        # Signed up through another worker since the last reload
+        xp = (await db.execute(select(User.xp).where(User.id == user_id))).scalar()
+        if xp is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        leaderboard.update(user_id, xp)
+
+@router.get("/around-me", response_model=LeaderboardNeighbourhood)
+async def get_leaderboard_around_me(
+    current_user: Principal = Depends(dependencies.get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
+    k: int = Query(5, ge=1, le=50, description="Users to show on each side"),
+) -> Any:
+    if settings.LEADERBOARD_IN_MEMORY:
+        await _ensure_ranked(db, current_user.id)
+        my_rank = leaderboard.rank(current_user.id)
+        first_rank = max(my_rank - k, 1)
+        ranked = leaderboard.top(my_rank - first_rank + 1 + k, offset=first_rank - 1)
+        result = await db.execute(select(*_PROFILE_COLUMNS).where(User.id.in_([user_id for user_id, _ in ranked])))
+        rows_by_id = {row.id: row for row in result}
+        entries = [
+            RankedLeaderboardEntry(**rows_by_id[user_id]._mapping, xp=xp, rank=rank)
+            for rank, (user_id, xp) in enumerate(ranked, first_rank)
+            if user_id in rows_by_id
+        ]
+        return LeaderboardNeighbourhood(rank=my_rank, entries=entries)
+
+    result = await db.execute(_neighbourhood_statement(current_user.id, k))
+    entries = [RankedLeaderboardEntry.model_validate(row) for row in result]
+    my_entry = next((entry for entry in entries if entry.id == current_user.id), None)
+    if my_entry is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return LeaderboardNeighbourhood(rank=my_entry.rank, entries=entries)
+
+@router.get("/me", response_model=LeaderboardRank)
+async def get_my_rank(
+    current_user: Principal = Depends(dependencies.get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
+) -> Any:
+    if settings.LEADERBOARD_IN_MEMORY:
+        await _ensure_ranked(db, current_user.id)
+        return LeaderboardRank(
+            user_id=current_user.id,
+            xp=leaderboard.xp(current_user.id),
+            rank=leaderboard.rank(current_user.id),
+            total=len(leaderboard),
+        )
+
+    xp = (await db.execute(select(User.xp).where(User.id == current_user.id))).scalar()
+    if xp is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    ahead = await db.execute(
+        select(func.count(User.id)).where(
+            or_(User.xp > xp, and_(User.xp == xp, User.id < current_user.id))
+        )
+    )
+    total = await db.execute(select(func.count(User.id)))
+    return LeaderboardRank(user_id=current_user.id, xp=xp, rank=ahead.scalar() + 1, total=total.scalar())
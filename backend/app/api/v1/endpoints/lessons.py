@@ -1,31 +1,54 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.database import get_db
+from app.core.http_cache import EncodedResponseCache, cached_json_response
+from app.db.database import get_read_db
 from app.schemas.course import Lesson as LessonSchema
 from app.schemas.course import Challenge as ChallengeSchema
 from app.services.course_service import CourseService
+from app.services.curriculum_cache import curriculum_cache, encode_nodes
 
 router = APIRouter()
 
+_responses = EncodedResponseCache(max_entries=2048)
+_lesson_adapter = TypeAdapter(LessonSchema)
+_challenges_adapter = TypeAdapter(List[ChallengeSchema])
+
 @router.get("/{lesson_id}", response_model=LessonSchema)
 async def read_lesson(
     lesson_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
 ) -> Any:
     course_service = CourseService(db)
-    lesson = await course_service.get_lesson(lesson_id)
-    if not lesson:
+
+    async def build() -> bytes | None:
+        lesson = await course_service.get_lesson(lesson_id)
+        return encode_nodes(_lesson_adapter, lesson) if lesson else None
+
+    response = await cached_json_response(
+        request, _responses, curriculum_cache.version, ("lesson", lesson_id), build
+    )
+    if response is None:
         raise HTTPException(status_code=404, detail="Lesson not found")
-    return lesson
+    return response
 
 @router.get("/{lesson_id}/challenges", response_model=List[ChallengeSchema])
 async def read_lesson_challenges(
     lesson_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
 ) -> Any:
     course_service = CourseService(db)
-    lesson = await course_service.get_lesson(lesson_id)
-    if not lesson:
+
+    async def build() -> bytes | None:
+        lesson = await course_service.get_lesson(lesson_id)
+        return encode_nodes(_challenges_adapter, lesson.challenges) if lesson else None
+
+    response = await cached_json_response(
+        request, _responses, curriculum_cache.version, ("challenges", lesson_id), build
+    )
+    if response is None:
         raise HTTPException(status_code=404, detail="Lesson not found")
-    return lesson.challenges
+    return response
@@ -4,15 +4,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import dependencies
 from app.db.database import get_db
 from app.models.user import User
-from app.schemas.progress import Progress as ProgressSchema
+from app.schemas.user import Principal
+from app.schemas.progress import Progress as ProgressSchema, LessonCompletion as LessonCompletionSchema
 from app.services.progress_service import ProgressService
-from app.services.user_service import UserService
 
 router = APIRouter()
 
 @router.get("/", response_model=List[ProgressSchema])
 async def read_progress(
-    current_user: User = Depends(dependencies.get_current_user),
+    current_user: Principal = Depends(dependencies.get_current_principal),
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     progress_service = ProgressService(db)
@@ -27,14 +27,24 @@ async def complete_lesson(
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     progress_service = ProgressService(db)
-    user_service = UserService(db)
-    
-    # Mark complete
-    progress = await progress_service.mark_lesson_completed(
-        current_user.id, lesson_id, hearts_used, points_earned
+
+    # Mark complete and update user XP/Streak in one transaction
+    completion = await progress_service.complete_lesson(
+        current_user, lesson_id, hearts_used, points_earned
+    )
+
+    return completion.progress
+
+@router.post("/lesson/{lesson_id}/completion", response_model=LessonCompletionSchema)
+async def complete_lesson_with_summary(
+    lesson_id: int,
+    hearts_used: int = Body(0, embed=True),
+    points_earned: int = Body(10, embed=True),
+    current_user: User = Depends(dependencies.get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Any:
+    """Complete a lesson and return the progress row, updated user and any awarded quests."""
+    progress_service = ProgressService(db)
+    return await progress_service.complete_lesson(
+        current_user, lesson_id, hearts_used, points_earned
     )
-    
-    # Update user XP/Streak
-    await user_service.add_xp(current_user, points_earned)
-    
-    return progress
@@ -3,22 +3,21 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.api import dependencies
-from app.db.database import get_db
-from app.models.user import User
-from app.models.quest import Quest, UserQuest
+from app.db.database import get_read_db
+from app.schemas.user import Principal
+from app.models.quest import UserQuest
 from app.schemas.quest import QuestProgress
+from app.services.quest_catalog import quest_catalog
 
 router = APIRouter()
 
 @router.get("/", response_model=List[QuestProgress])
 async def read_quests(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(dependencies.get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(dependencies.get_current_principal),
 ) -> Any:
     """Retrieve quests with current user's completion status."""
-    # Fetch all quests
-    result = await db.execute(select(Quest))
-    quests = result.scalars().all()
+    quests = (await quest_catalog.get(db)).quests
     
     # Fetch user's completed quests
     user_quests_result = await db.execute(
@@ -4,7 +4,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import dependencies
 from app.db.database import get_db
 from app.models.user import User
-from app.schemas.user import User as UserSchema, UserUpdate
+from app.schemas.user import Principal, User as UserSchema, UserUpdate
+from app.services.user_cache import user_cache
 from app.services.user_service import UserService
 import uuid
 import os
@@ -17,7 +18,7 @@ router = APIRouter()
 @router.post("/upload")
 async def upload_user_media(
     file: UploadFile = File(...),
-    current_user: User = Depends(dependencies.get_current_user),
+    current_user: Principal = Depends(dependencies.get_current_principal),
 ) -> Any:
     """Upload a profile avatar."""
     # Check file extension
@@ -103,8 +104,10 @@ async def freeze_streak(
 ) -> Any:
     # Logic to activate freeze (e.g. deduct points/gems?)
     # For now just set true
+    await user_cache.refresh_if_cached(db, current_user)
     current_user.streak_frozen = True
     db.add(current_user)
     await db.commit()
+    user_cache.invalidate(current_user.id)
     await db.refresh(current_user)
     return {"status": "streak frozen"}
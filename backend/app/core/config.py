@@ -27,18 +27,53 @@ class Settings(BaseSettings):
     VERCEL_ENV: str = ""
     
     DATABASE_URL: str = _database_url_from_env()
+    DATABASE_REPLICA_URL: str = ""
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Opt-in: sign role/version claims into access tokens so identity-only
+    # endpoints can authorize without reading users; claims go stale after the TTL.
+    # A role change revokes outstanding claims once every worker has re-read
+    # users.token_version, i.e. within TOKEN_VERSION_REFRESH_SECONDS.
+    ACCESS_TOKEN_CLAIMS: bool = False
+    ACCESS_TOKEN_CLAIMS_TTL_SECONDS: int = 60
+    TOKEN_VERSION_REFRESH_SECONDS: int = 5
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 1800
     DB_POOL_MODE: str = "auto"
+    # Connections kept open per process behind a transaction pooler or on
+    # Vercel. 0 opens a new connection for every checkout (NullPool).
+    DB_POOLER_POOL_SIZE: int = 0
     DB_SSL_MODE: str = "auto"
     DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
     DB_DISABLE_POSTGRES_JIT: bool = False
+    # Per-request SQL instrumentation (budget logs, optional Server-Timing header)
+    SQL_INSTRUMENTATION: bool = True
+    SQL_STATEMENT_BUDGET: int = 20
+    SQL_TIME_BUDGET_MS: int = 200
+    SQL_REPEAT_THRESHOLD: int = 5
+    # Exposes per-request SQL counts and timings to every client; development only
+    SQL_SERVER_TIMING: bool = False
+    # Fill the pool and run hot statements before reporting ready
+    WARMUP_ON_STARTUP: bool = True
+    WARMUP_CURRICULUM: bool = True
+    WARMUP_TIMEOUT_SECONDS: int = 30
+    # Opt-in: serve the leaderboard from an in-memory ranking instead of sorting
+    # users per request. Each worker ranks from its own snapshot, so workers can
+    # disagree until their next refresh (at most LEADERBOARD_REFRESH_SECONDS).
+    LEADERBOARD_IN_MEMORY: bool = False
+    LEADERBOARD_REFRESH_SECONDS: int = 60
+    CURRICULUM_CACHE_TTL_SECONDS: int = 60
+    QUEST_CATALOG_TTL_SECONDS: int = 300
+    COURSE_JSON_AGGREGATION: bool = False
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_ENTRIES: int = 10000
     
     GOOGLE_CLIENT_ID: str = ""
     GOOGLE_CLIENT_SECRET: str = ""
@@ -47,7 +82,13 @@ class Settings(BaseSettings):
     FRONTEND_URL: str = "http://localhost:3000"
     ALLOWED_ORIGINS: Union[List[str], str] = ["http://localhost:3000", "http://puolingo.com"]
     UPLOAD_DIR: str = "uploads"
+    LOG_LEVEL: str = "INFO"
+    # Per-logger overrides, e.g. "app.auth=DEBUG,sqlalchemy.engine=WARNING"
+    LOG_LEVELS: str = ""
+    LOG_JSON: bool = True
+    LOG_DEBUG_SAMPLE_RATE: float = 0.1
     FIREBASE_PROJECT_ID: str = _firebase_project_id_from_env()
+    FIREBASE_JWKS_URL: str = "https://www.googleapis.com/service_accounts/v1/jwk/securetoken@system.gserviceaccount.com"
 
     model_config = SettingsConfigDict(case_sensitive=True, env_file=".env", extra="ignore")
 
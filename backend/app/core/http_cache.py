@@ -0,0 +1,95 @@
+import hashlib
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+
+CachedBody = Tuple[str, bytes]
+
+
+def make_etag(body: bytes) -> str:
+    # Strong validator: derived from the exact bytes we send.
+    return '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # If-None-Match uses the weak comparison function (RFC 9110 13.1.2).
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class EncodedResponseCache:
+    """Encoded JSON bodies and their ETags, valid for a single content version.
+
+    Entries from an older version are dropped as soon as a newer version is
+    stored, so stale payloads are never served after an invalidation.
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._version: Optional[int] = None
+        self._entries: "OrderedDict[Hashable, CachedBody]" = OrderedDict()
+
+    def get(self, version: int, key: Hashable) -> Optional[CachedBody]:
+        if version != self._version:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, version: int, key: Hashable, body: bytes) -> CachedBody:
+        entry = (make_etag(body), body)
+        if self._version is not None and version < self._version:
+            # Built from content that has since been invalidated.
+            return entry
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+
+def encoded_response(
+    request: Request, entry: CachedBody, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    etag, body = entry
+    response_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if headers:
+        response_headers.update(headers)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=response_headers)
+    return Response(content=body, media_type="application/json", headers=response_headers)
+
+
+async def cached_json_response(
+    request: Request,
+    cache: EncodedResponseCache,
+    version: int,
+    key: Hashable,
+    build: Callable[[], Awaitable[Optional[bytes]]],
+    headers: Optional[Dict[str, str]] = None,
+) -> Optional[Response]:
+    """Serve ``key`` from ``cache``, encoding it with ``build`` on a miss.
+
+    Returns ``None`` when ``build`` does, so callers can raise their own 404.
+    """
+    entry = cache.get(version, key)
+    if entry is None:
+        body = await build()
+        if body is None:
+            return None
+        entry = cache.put(version, key, body)
+    return encoded_response(request, entry, headers)
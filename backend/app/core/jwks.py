@@ -0,0 +1,99 @@
+import asyncio
+import re
+import time
+from typing import Dict, Optional
+
+from jose import jwk
+from jose.backends.base import Key
+
+from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.log import get_logger
+
+logger = get_logger(__name__)
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class JWKSCache:
+    """Signing keys from a JWKS endpoint, parsed once and indexed by ``kid``.
+
+    Keys are kept for the ``Cache-Control: max-age`` of the JWKS response and
+    refreshed in the background shortly before they expire, so logins do not wait
+    on the fetch. A token signed with an unknown ``kid`` (key rotation) triggers
+    at most one refetch per ``min_refetch_interval``. If a refresh fails, the
+    previous keys stay in use.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        algorithm: str = "RS256",
+        default_max_age: int = 3600,
+        refresh_margin: int = 300,
+        min_refetch_interval: int = 30,
+    ):
+        self.url = url
+        self._algorithm = algorithm
+        self._default_max_age = default_max_age
+        self._refresh_margin = refresh_margin
+        self._min_refetch_interval = min_refetch_interval
+        self._keys: Dict[str, Key] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _max_age(self, cache_control: str) -> int:
+        match = _MAX_AGE.search(cache_control or "")
+        return int(match.group(1)) if match else self._default_max_age
+
+    async def _fetch(self) -> None:
+        response = await get_http_client().get(self.url)
+        response.raise_for_status()
+        keys = {
+            data["kid"]: jwk.construct(data, self._algorithm)
+            for data in response.json().get("keys", [])
+            if data.get("kid")
+        }
+        now = time.monotonic()
+        self._keys = keys
+        self._fetched_at = now
+        self._expires_at = now + self._max_age(response.headers.get("cache-control"))
+
+    async def refresh(self, force: bool = False) -> None:
+        started = time.monotonic()
+        async with self._lock:
+            # Another caller refreshed while we waited for the lock
+            if self._fetched_at >= started or (not force and time.monotonic() < self._expires_at):
+                return
+            try:
+                await self._fetch()
+            except Exception as e:
+                if not self._keys:
+                    raise
+                logger.warning("JWKS refresh from %s failed, keeping %d cached keys: %s", self.url, len(self._keys), e)
+                # Keep serving the old keys and retry after a short back-off
+                self._expires_at = time.monotonic() + self._min_refetch_interval
+
+    def _refresh_in_background(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh(force=True))
+            # Failures are retried by the next caller; keep them out of the loop's log
+            self._refresh_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    async def get_key(self, kid: str) -> Optional[Key]:
+        now = time.monotonic()
+        if now >= self._expires_at:
+            await self.refresh()
+        elif now >= self._expires_at - self._refresh_margin:
+            self._refresh_in_background()
+
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._fetched_at >= self._min_refetch_interval:
+            await self.refresh(force=True)
+            key = self._keys.get(kid)
+        return key
+
+
+firebase_jwks = JWKSCache(settings.FIREBASE_JWKS_URL)
@@ -0,0 +1,188 @@
+"""Structured, non-blocking logging.
+
+Records are handed to a bounded in-memory queue on the calling thread and
+written to stdout as JSON lines by a background listener thread, so logging
+never does I/O on the event loop. When the queue is full, records are dropped
+and counted instead of blocking.
+
+Each record carries the current request id (see ``RequestContextMiddleware``).
+DEBUG records can be sampled to keep high-volume events cheap.
+"""
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from app.core.metrics import Counter
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+LOG_RECORDS_DROPPED = Counter("log_records_dropped", "Log records dropped because the log queue was full.")
+
+# Attributes every LogRecord has; anything else was passed via ``extra``.
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "request_id"}
+
+_listener: Optional[QueueListener] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(name)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class DebugSampler(logging.Filter):
+    """Keeps roughly ``rate`` of DEBUG records; other levels always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve everything that depends on the calling context or holds
+        # references (args, traceback) before the record changes threads.
+        record.request_id = request_id_var.get()
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+def _parse_levels(levels: str) -> Dict[str, str]:
+    """``"app.auth=DEBUG,sqlalchemy.engine=WARNING"`` -> ``{name: level}``."""
+    parsed = {}
+    for item in levels.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            parsed[name.strip()] = level.strip().upper()
+    return parsed
+
+
+def setup_logging(
+    level: str = "INFO",
+    logger_levels: str = "",
+    json_format: bool = True,
+    debug_sample_rate: float = 1.0,
+    queue_size: int = 10000,
+) -> None:
+    """Route the root logger through the queue. Safe to call more than once."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(
+        JsonFormatter() if json_format else logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    handler = _NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    handler.addFilter(DebugSampler(debug_sample_rate))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        if isinstance(existing, _NonBlockingQueueHandler):
+            root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+    for name, logger_level in _parse_levels(logger_levels).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    _listener = QueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+@atexit.register
+def shutdown_logging() -> None:
+    """Flush queued records; called at interpreter exit."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestContextMiddleware:
+    """ASGI middleware that tags each HTTP request with a request id.
+
+    Reuses an incoming ``X-Request-ID`` header, echoes the id on the response
+    and logs one access record per request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.logger = get_logger("app.access")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        # Not reset afterwards: servers run each request in its own task, and
+        # the outer error handler should still see the id when logging.
+        request_id_var.set(request_id)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "%s %s %s",
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    extra={"duration_ms": round((time.perf_counter() - started) * 1000, 1)},
+                )
@@ -1,10 +1,33 @@
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union, Optional
+from typing import Any, Callable, Union, Optional
+from fastapi import HTTPException, status
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.log import get_logger
+from app.core.metrics import Counter, Gauge, Histogram
+from app.schemas.user import TokenPayload
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = get_logger(__name__)
+
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_seconds", "Time spent in bcrypt per call.", ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0),
+)
+PASSWORD_HASH_WAIT_SECONDS = Histogram(
+    "password_hash_wait_seconds", "Time a bcrypt call waited for a hashing thread.", ["operation"],
+)
+PASSWORD_HASH_PENDING = Gauge("password_hash_pending", "bcrypt calls queued or running.")
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected", "bcrypt calls refused because the queue was full.", ["operation"],
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -12,13 +35,144 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
-def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+
+class PasswordHasher:
+    """Runs bcrypt on a small dedicated thread pool instead of the event loop.
+
+    bcrypt releases the GIL, so other requests keep being served while a hash
+    runs. At most ``max_pending`` calls may be queued or running; beyond that
+    callers get an immediate 503 rather than piling up behind a login burst.
+    A slot is held by the executor future, not the awaiting request, so a
+    disconnected client frees it only once its bcrypt call is done or dropped.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._max_pending = max_pending
+        self._pending = 0
+        # Slots are released from executor threads
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> bool:
+        with self._lock:
+            if self._pending >= self._max_pending:
+                return False
+            self._pending += 1
+            PASSWORD_HASH_PENDING.set(self._pending)
+            return True
+
+    def _release(self, future=None) -> None:
+        with self._lock:
+            self._pending -= 1
+            PASSWORD_HASH_PENDING.set(self._pending)
+
+    async def _run(self, operation: str, function: Callable, *args) -> Any:
+        if not self._acquire():
+            PASSWORD_HASH_REJECTED.inc(operation=operation)
+            logger.warning("Password hashing queue full, rejecting %s", operation)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-in attempts in progress, please retry",
+                headers={"Retry-After": "1"},
+            )
+
+        queued_at = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            PASSWORD_HASH_WAIT_SECONDS.observe(started - queued_at, operation=operation)
+            try:
+                return function(*args)
+            finally:
+                PASSWORD_HASH_SECONDS.observe(time.perf_counter() - started, operation=operation)
+
+        try:
+            future = self._executor.submit(timed)
+        except BaseException:
+            self._release()
+            raise
+        # Runs when the call finishes or is cancelled before starting
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("verify", verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", get_password_hash, password)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+class TokenCache:
+    """Decoded, verified tokens keyed by a digest of the token, kept until ``exp``.
+
+    A token is presented on every request of a session; a hit skips the HMAC
+    check, JSON parsing and ``TokenPayload`` validation. Only tokens that decoded
+    successfully and carry ``exp`` are stored. Returned payloads are shared and
+    must not be mutated.
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[bytes, TokenPayload]" = OrderedDict()
+
+    def decode(self, token: str) -> TokenPayload:
+        """Verify and decode ``token``; raises ``JWTError`` or ``ValidationError``."""
+        key = hashlib.sha256(token.encode()).digest()
+        token_data = self._entries.get(key)
+        if token_data is not None:
+            if token_data.exp > time.time():
+                self._entries.move_to_end(key)
+                return token_data
+            del self._entries[key]
+
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        token_data = TokenPayload(**payload)
+        if token_data.exp is not None:
+            self._entries[key] = token_data
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return token_data
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_MAX_ENTRIES)
+
+
+def decode_token(token: str) -> TokenPayload:
+    return token_cache.decode(token)
+
+
+def user_token_claims(user: Any) -> dict:
+    """Signed snapshot of ``user`` for the claims-only auth path, empty unless enabled.
+
+    ``cexp`` bounds how long the snapshot is trusted; after that, or once the
+    user's ``token_version`` moves past ``ver``, the token only proves identity.
+    """
+    if not settings.ACCESS_TOKEN_CLAIMS:
+        return {}
+    claims_expire = datetime.now(timezone.utc) + timedelta(seconds=settings.ACCESS_TOKEN_CLAIMS_TTL_SECONDS)
+    return {
+        "adm": bool(user.is_admin),
+        "ver": user.token_version,
+        "cexp": int(claims_expire.timestamp()),
+    }
+
+def create_access_token(
+    subject: Union[str, Any], expires_delta: Optional[timedelta] = None, claims: Optional[dict] = None
+) -> str:
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": expire, "sub": str(subject), **(claims or {})}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
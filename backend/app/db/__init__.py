@@ -1 +1 @@
-from .database import Base, get_db, engine, AsyncSessionLocal
+from .database import Base, get_db, get_read_db, engine, read_engine, AsyncSessionLocal, ReadSessionLocal
@@ -1,23 +1,24 @@
-from uuid import uuid4
 from urllib.parse import urlsplit
 
+from fastapi import Depends
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 from app.core.config import settings
 from app.core.runtime import is_running_on_vercel
-from sqlalchemy.pool import NullPool
+from app.db.pool_metrics import InstrumentedNullPool, InstrumentedQueuePool, instrument_engine
+from app.db.query_stats import instrument_statements
 
-def _database_host() -> str:
-    return (urlsplit(settings.DATABASE_URL).hostname or "").lower()
+def _database_host(url: str = settings.DATABASE_URL) -> str:
+    return (urlsplit(url).hostname or "").lower()
 
 
-def _database_port() -> int | None:
-    return urlsplit(settings.DATABASE_URL).port
+def _database_port(url: str = settings.DATABASE_URL) -> int | None:
+    return urlsplit(url).port
 
 
-def _uses_transaction_pooler() -> bool:
-    host = _database_host()
-    port = _database_port()
+def _uses_transaction_pooler(url: str = settings.DATABASE_URL) -> bool:
+    host = _database_host(url)
+    port = _database_port(url)
 
     if settings.DB_POOL_MODE == "transaction":
         return True
@@ -27,51 +28,90 @@ def _uses_transaction_pooler() -> bool:
     return "pooler." in host or port == 6543
 
 
-def _should_require_ssl() -> bool:
+def _should_require_ssl(url: str = settings.DATABASE_URL) -> bool:
     if settings.DB_SSL_MODE == "require":
         return True
     if settings.DB_SSL_MODE == "disable":
         return False
 
-    host = _database_host()
+    host = _database_host(url)
     return host not in {"", "localhost", "127.0.0.1"}
 
 
-use_transaction_pooler = _uses_transaction_pooler()
-connect_args = {}
-
-if _should_require_ssl():
-    connect_args["ssl"] = "require"
-
-if use_transaction_pooler:
-    connect_args["prepared_statement_cache_size"] = 0
-    connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
-else:
-    connect_args["prepared_statement_cache_size"] = settings.DB_PREPARED_STATEMENT_CACHE_SIZE
-
-if settings.DB_DISABLE_POSTGRES_JIT:
-    connect_args["server_settings"] = {"jit": "off"}
-
-engine_kwargs = {
-    "echo": False,
-    "pool_pre_ping": True,
-}
-
-if connect_args:
-    engine_kwargs["connect_args"] = connect_args
+def _engine_kwargs(url: str) -> dict:
+    use_transaction_pooler = _uses_transaction_pooler(url)
+    connect_args = {}
+
+    if _should_require_ssl(url):
+        connect_args["ssl"] = "require"
+
+    if use_transaction_pooler:
+        # Unnamed statements only: asyncpg re-parses them on every execution
+        # and nothing is left behind on the server connection, which the
+        # pooler may hand to another client after each transaction.
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: ""
+        connect_args["statement_cache_size"] = 0
+    else:
+        connect_args["prepared_statement_cache_size"] = settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+
+    if settings.DB_DISABLE_POSTGRES_JIT:
+        connect_args["server_settings"] = {"jit": "off"}
+
+    engine_kwargs = {
+        "echo": False,
+        "pool_pre_ping": True,
+    }
+
+    if connect_args:
+        engine_kwargs["connect_args"] = connect_args
+
+    if is_running_on_vercel() or use_transaction_pooler:
+        if settings.DB_POOLER_POOL_SIZE > 0:
+            # All statements run inside transactions, so the rollback on
+            # checkin is the only session state to reset; anything broader
+            # (RESET ALL, DISCARD) would hit whichever server connection the
+            # pooler picks.
+            engine_kwargs.update(
+                poolclass=InstrumentedQueuePool,
+                pool_size=settings.DB_POOLER_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+                pool_recycle=settings.DB_POOL_RECYCLE,
+                pool_reset_on_return="rollback",
+            )
+        else:
+            engine_kwargs["poolclass"] = InstrumentedNullPool
+    else:
+        engine_kwargs.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+
+    return engine_kwargs
+
+
+engine = create_async_engine(settings.DATABASE_URL, **_engine_kwargs(settings.DATABASE_URL))
+instrument_engine(engine, "primary")
+if settings.SQL_INSTRUMENTATION:
+    instrument_statements(engine)
+AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
-if is_running_on_vercel() or use_transaction_pooler:
-    engine_kwargs["poolclass"] = NullPool
-else:
-    engine_kwargs.update(
-        pool_size=settings.DB_POOL_SIZE,
-        max_overflow=settings.DB_MAX_OVERFLOW,
-        pool_timeout=settings.DB_POOL_TIMEOUT,
-        pool_recycle=settings.DB_POOL_RECYCLE,
+# Optional read replica for content and leaderboard reads. Without one, reads
+# share the primary engine and nothing changes.
+if settings.DATABASE_REPLICA_URL:
+    read_engine = create_async_engine(
+        settings.DATABASE_REPLICA_URL, **_engine_kwargs(settings.DATABASE_REPLICA_URL)
     )
-
-engine = create_async_engine(settings.DATABASE_URL, **engine_kwargs)
-AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    instrument_engine(read_engine, "replica")
+    if settings.SQL_INSTRUMENTATION:
+        instrument_statements(read_engine)
+else:
+    read_engine = engine
+ReadSessionLocal = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
 
 class Base(DeclarativeBase):
     pass
@@ -83,3 +123,24 @@ async def get_db():
         except Exception:
             await session.rollback()
             raise
+
+async def get_read_db():
+    """Session on the read replica, for GET endpoints that tolerate replication lag.
+
+    Writes and read-your-own-writes paths must keep using ``get_db``.
+    """
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+if read_engine is engine:
+    async def get_read_db(db: AsyncSession = Depends(get_db)):
+        """Without a replica, the request's ``get_db`` session.
+
+        A second session would check out a second connection from the same
+        pool whenever an endpoint also resolves the user through ``get_db``.
+        """
+        yield db
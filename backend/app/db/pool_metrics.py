@@ -0,0 +1,104 @@
+"""Connection pool telemetry, exported through ``app.core.metrics``.
+
+Checkout wait and pool timeouts are timed by the instrumented pool classes;
+everything else comes from pool and engine events wired up by
+``instrument_engine``. All series carry an ``engine`` label (``primary`` or
+``replica``).
+"""
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from app.core.metrics import Counter, Gauge, Histogram
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection, including connecting when none is idle.",
+    ["engine"],
+)
+DB_POOL_TIMEOUTS = Counter("db_pool_timeouts", "Checkouts that gave up after DB_POOL_TIMEOUT.", ["engine"])
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections currently checked out.", ["engine"])
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured pool_size (0 without pooling).", ["engine"])
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond pool_size.", ["engine"])
+DB_POOL_CONNECTIONS_OPENED = Counter("db_pool_connections_opened", "New DBAPI connections.", ["engine"])
+DB_POOL_INVALIDATIONS = Counter("db_pool_invalidations", "Connections invalidated after an error.", ["engine"])
+DB_POOL_PRE_PING_FAILURES = Counter("db_pool_pre_ping_failures", "Failed pre-ping checks on checkout.", ["engine"])
+DB_POOL_CONNECTION_LIFETIME = Histogram(
+    "db_pool_connection_lifetime_seconds",
+    "Age of DBAPI connections when they are closed.",
+    ["engine"],
+    buckets=(1, 10, 60, 300, 900, 1800, 3600, 7200),
+)
+
+
+class _InstrumentedPool:
+    """Times ``_do_get``, the step where a checkout waits for a free slot."""
+
+    metrics_label = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.inc(engine=self.metrics_label)
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, engine=self.metrics_label)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_label = self.metrics_label
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(_InstrumentedPool, NullPool):
+    pass
+
+
+def instrument_engine(engine: AsyncEngine, label: str) -> None:
+    sync_engine = engine.sync_engine
+    pool = sync_engine.pool
+    pool.metrics_label = label
+
+    DB_POOL_CHECKED_OUT.set(0, engine=label)
+    DB_POOL_SIZE.set(pool.size() if isinstance(pool, AsyncAdaptedQueuePool) else 0, engine=label)
+    DB_POOL_OVERFLOW.set_function(
+        # Read from the engine each time: dispose() swaps in a new pool
+        lambda: max(sync_engine.pool.overflow(), 0) if isinstance(sync_engine.pool, AsyncAdaptedQueuePool) else 0,
+        engine=label,
+    )
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        connection_record.info["connected_at"] = time.monotonic()
+        DB_POOL_CONNECTIONS_OPENED.inc(engine=label)
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc(engine=label)
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec(engine=label)
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        DB_POOL_INVALIDATIONS.inc(engine=label)
+
+    @event.listens_for(pool, "close")
+    def on_close(dbapi_connection, connection_record):
+        connected_at = connection_record.info.get("connected_at")
+        if connected_at is not None:
+            DB_POOL_CONNECTION_LIFETIME.observe(time.monotonic() - connected_at, engine=label)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def on_error(context):
+        if context.is_pre_ping:
+            DB_POOL_PRE_PING_FAILURES.inc(engine=label)
@@ -0,0 +1,126 @@
+"""Per-request SQL statement counts and database time.
+
+``instrument_statements`` hooks the cursor events of an engine and adds every
+statement to the ``QueryStats`` of the current request, which
+``QueryStatsMiddleware`` installs. The middleware logs requests that exceed the
+statement or time budget, or that repeat the same statement often enough to
+suggest an N+1 query, and can report the totals in a ``Server-Timing`` header.
+"""
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.log import get_logger
+
+logger = get_logger("app.sql")
+
+_query_stats_var: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+class QueryStats:
+    __slots__ = ("count", "duration", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _query_stats_var.get()
+
+
+def instrument_statements(engine: AsyncEngine) -> None:
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        stats = _query_stats_var.get()
+        if stats is not None:
+            stats.record(statement, time.perf_counter() - started)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(context):
+        # A failed statement never reaches after_cursor_execute
+        if context.connection is not None and context.connection.info.get("query_started"):
+            context.connection.info["query_started"].pop()
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware that collects ``QueryStats`` for each HTTP request.
+
+    Logs requests over ``statement_budget`` statements or ``time_budget_ms`` of
+    database time, plus statements repeated ``repeat_threshold`` times or more.
+    With ``server_timing``, also adds ``Server-Timing: db;dur=<ms>;desc="<n> queries"``
+    to the response; that is visible to any client, so keep it off in production.
+    """
+
+    def __init__(
+        self,
+        app,
+        statement_budget: int = 20,
+        time_budget_ms: float = 200,
+        repeat_threshold: int = 5,
+        server_timing: bool = False,
+    ):
+        self.app = app
+        self.statement_budget = statement_budget
+        self.time_budget_ms = time_budget_ms
+        self.repeat_threshold = repeat_threshold
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _query_stats_var.set(stats)
+
+        async def send_with_server_timing(message):
+            if message["type"] == "http.response.start":
+                timing = 'db;dur=%.1f;desc="%d queries"' % (stats.duration * 1000, stats.count)
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing if self.server_timing else send)
+        finally:
+            _query_stats_var.reset(token)
+            self._report(scope, stats)
+
+    def _report(self, scope, stats: QueryStats) -> None:
+        duration_ms = round(stats.duration * 1000, 1)
+        if stats.count > self.statement_budget or duration_ms > self.time_budget_ms:
+            logger.warning(
+                "%s %s exceeded the SQL budget: %d statements, %.1f ms",
+                scope["method"],
+                scope["path"],
+                stats.count,
+                duration_ms,
+                extra={"db_statements": stats.count, "db_ms": duration_ms},
+            )
+        for statement, count in stats.repeated(self.repeat_threshold):
+            logger.warning(
+                "%s %s ran the same statement %d times (possible N+1): %s",
+                scope["method"],
+                scope["path"],
+                count,
+                " ".join(statement.split())[:300],
+                extra={"db_repeats": count},
+            )
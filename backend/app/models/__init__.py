@@ -1,4 +1,5 @@
 from .user import User
 from .course import Course, Unit, Lesson, Challenge, ChallengeOption
-from .progress import UserProgress
+from .progress import UserProgress, UserUnitProgress, UserCourseProgress
 from .quest import Quest, UserQuest
+from .xp import XpEvent, UserXpDaily, UserXpWeekly
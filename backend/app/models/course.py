@@ -20,7 +20,7 @@ class Unit(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    course_id: Mapped[int] = mapped_column(ForeignKey("courses.id"))
+    course_id: Mapped[int] = mapped_column(ForeignKey("courses.id"), index=True)
     order_index: Mapped[int] = mapped_column(Integer, default=0)
     
     course: Mapped["Course"] = relationship("Course", back_populates="units")
@@ -31,7 +31,7 @@ class Lesson(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String)
-    unit_id: Mapped[int] = mapped_column(ForeignKey("units.id"))
+    unit_id: Mapped[int] = mapped_column(ForeignKey("units.id"), index=True)
     order_index: Mapped[int] = mapped_column(Integer, default=0)
     
     unit: Mapped["Unit"] = relationship("Unit", back_populates="lessons")
@@ -42,7 +42,7 @@ class Challenge(Base):
     __tablename__ = "challenges"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    lesson_id: Mapped[int] = mapped_column(ForeignKey("lessons.id"))
+    lesson_id: Mapped[int] = mapped_column(ForeignKey("lessons.id"), index=True)
     type: Mapped[str] = mapped_column(String) # e.g., "SELECT", "SELECT_IMAGE", "ASSIST", "TRANSLATE", "MATCH", "TAP_HEAR", "LISTEN_TYPE", "SPEAK"
     question: Mapped[str] = mapped_column(Text)
     correct_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True) # For non-option based challenges
@@ -56,7 +56,7 @@ class ChallengeOption(Base):
     __tablename__ = "challenge_options"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    challenge_id: Mapped[int] = mapped_column(ForeignKey("challenges.id"))
+    challenge_id: Mapped[int] = mapped_column(ForeignKey("challenges.id"), index=True)
     text: Mapped[str] = mapped_column(String)
     correct: Mapped[bool] = mapped_column(Boolean, default=False)
     image_src: Mapped[Optional[str]] = mapped_column(String, nullable=True)
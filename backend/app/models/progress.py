@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Integer, Boolean, DateTime, ForeignKey
+from sqlalchemy import Integer, Boolean, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from typing import TYPE_CHECKING
@@ -11,6 +11,10 @@ if TYPE_CHECKING:
 
 class UserProgress(Base):
     __tablename__ = "user_progress"
+    __table_args__ = (
+        # One row per user and lesson; also the conflict target for completion upserts
+        UniqueConstraint("user_id", "lesson_id", name="uq_user_progress_user_id_lesson_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
@@ -24,3 +28,21 @@ class UserProgress(Base):
     user: Mapped[User] = relationship("User", back_populates="progress")
     # Optional: relationship to Lesson if we want to access lesson details directly from progress
     # lesson: Mapped["Lesson"] = relationship("Lesson") 
+
+
+class UserUnitProgress(Base):
+    """Completed-lesson count per user and unit, maintained on lesson completion."""
+    __tablename__ = "user_unit_progress"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unit_id: Mapped[int] = mapped_column(ForeignKey("units.id", ondelete="CASCADE"), primary_key=True)
+    completed_lessons: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class UserCourseProgress(Base):
+    """Completed-lesson count per user and course, maintained on lesson completion."""
+    __tablename__ = "user_course_progress"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    course_id: Mapped[int] = mapped_column(ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    completed_lessons: Mapped[int] = mapped_column(Integer, default=0)
@@ -18,7 +18,7 @@ class UserQuest(Base):
     __tablename__ = "user_quests"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
     quest_id: Mapped[int] = mapped_column(ForeignKey("quests.id"))
     completed: Mapped[bool] = mapped_column(Boolean, default=False)
     completion_date: Mapped[datetime] = mapped_column(DateTime, nullable=True)
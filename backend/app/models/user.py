@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Integer, String, Boolean, DateTime, Date
+from sqlalchemy import Integer, String, Boolean, DateTime, Date, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime, date
 from typing import Optional, TYPE_CHECKING
@@ -31,9 +31,18 @@ class User(Base):
     last_activity_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     longest_streak: Mapped[int] = mapped_column(Integer, default=0)
     streak_frozen: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    # Bumped to make claims in outstanding access tokens stale (e.g. role changes)
+    token_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     progress: Mapped[list[UserProgress]] = relationship("UserProgress", back_populates="user")
+
+
+# Leaderboard order; keyset pages seek straight to their (xp, id) cursor
+Index("ix_users_xp_desc_id", User.xp.desc(), User.id)
+# Only users whose role ever changed; read in full by the token version sync
+Index("ix_users_token_version", User.id, User.token_version, postgresql_where=User.token_version > 0)
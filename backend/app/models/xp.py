@@ -0,0 +1,42 @@
+from sqlalchemy import BigInteger, Integer, Date, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime, date
+from app.db.database import Base
+
+
+class XpEvent(Base):
+    """Append-only ledger of XP gains; the daily and weekly totals are rolled up from it."""
+    __tablename__ = "xp_events"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    amount: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class UserXpDaily(Base):
+    """XP gained per user and UTC day, maintained with each ledger insert."""
+    __tablename__ = "user_xp_daily"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    xp: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class UserXpWeekly(Base):
+    """XP gained per user and UTC week (starting Monday), maintained with each ledger insert."""
+    __tablename__ = "user_xp_weekly"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    week_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    xp: Mapped[int] = mapped_column(Integer, default=0)
+
+
+# Per-period leaderboard order, for keyset pages within one day or week
+Index("ix_user_xp_daily_day_xp_desc_user_id", UserXpDaily.day, UserXpDaily.xp.desc(), UserXpDaily.user_id)
+Index(
+    "ix_user_xp_weekly_week_start_xp_desc_user_id",
+    UserXpWeekly.week_start,
+    UserXpWeekly.xp.desc(),
+    UserXpWeekly.user_id,
+)
@@ -0,0 +1,29 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class LeaderboardRank(BaseModel):
+    user_id: int
+    xp: int
+    rank: int
+    total: int
+
+
+class LeaderboardEntry(BaseModel):
+    id: int
+    full_name: Optional[str] = None
+    image_src: Optional[str] = None
+    xp: int
+
+    class Config:
+        from_attributes = True
+
+
+class RankedLeaderboardEntry(LeaderboardEntry):
+    rank: int
+
+
+class LeaderboardNeighbourhood(BaseModel):
+    rank: int
+    entries: List[RankedLeaderboardEntry]
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+from app.schemas.quest import Quest
+from app.schemas.user import User
 
 class ProgressBase(BaseModel):
     lesson_id: int
@@ -21,3 +23,12 @@ class Progress(ProgressBase):
     
     class Config:
         from_attributes = True
+
+class LessonCompletion(BaseModel):
+    """Everything the client needs after finishing a lesson, from one transaction."""
+    progress: Progress
+    user: User
+    awarded_quests: List[Quest] = []
+
+    class Config:
+        from_attributes = True
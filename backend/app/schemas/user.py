@@ -41,6 +41,17 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     sub: Optional[str] = None
+    exp: Optional[int] = None
+    refresh: Optional[bool] = None
+    # Optional signed claims, see core.security.user_token_claims
+    adm: Optional[bool] = None
+    ver: Optional[int] = None
+    cexp: Optional[int] = None
+
+class Principal(BaseModel):
+    """Authenticated caller, from fresh token claims or from the users row."""
+    id: int
+    is_admin: bool = False
 
 class FirebaseLoginRequest(BaseModel):
     token: str
@@ -9,17 +9,28 @@ from app.schemas.admin_content import (
     ChallengeCreate, ChallengeUpdate,
     ChallengeOptionCreate, ChallengeOptionUpdate
 )
+from app.core.log import get_logger
+from app.services.curriculum_cache import curriculum_cache
 from typing import List
+logger = get_logger(__name__)
+
 
 class AdminContentService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    async def _commit(self) -> None:
+        # Every content edit goes through here so cached curriculum reads never
+        # outlive the change.
+        await self.db.commit()
+        curriculum_cache.invalidate()
+        logger.info("Curriculum edited, cache invalidated", extra={"version": curriculum_cache.version})
+
     # Course CRUD
     async def create_course(self, course_in: CourseCreate) -> Course:
         course = Course(**course_in.model_dump())
         self.db.add(course)
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(course)
         return course
 
@@ -43,7 +54,7 @@ class AdminContentService:
             setattr(course, field, value)
         
         self.db.add(course)
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(course)
         return course
 
@@ -53,14 +64,14 @@ class AdminContentService:
         if not course:
             return False
         await self.db.delete(course)
-        await self.db.commit()
+        await self._commit()
         return True
 
     # Unit CRUD
     async def create_unit(self, unit_in: UnitCreate) -> Unit:
         unit = Unit(**unit_in.model_dump())
         self.db.add(unit)
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(unit)
         return unit
 
@@ -83,7 +94,7 @@ class AdminContentService:
             setattr(unit, field, value)
         
         self.db.add(unit)
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(unit)
         return unit
 
@@ -93,14 +104,14 @@ class AdminContentService:
         if not unit:
             return False
         await self.db.delete(unit)
-        await self.db.commit()
+        await self._commit()
         return True
 
     # Lesson CRUD
     async def create_lesson(self, lesson_in: LessonCreate) -> Lesson:
         lesson = Lesson(**lesson_in.model_dump())
         self.db.add(lesson)
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(lesson)
         return lesson
 
@@ -119,7 +130,7 @@ class AdminContentService:
             setattr(lesson, field, value)
         
         self.db.add(lesson)
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(lesson)
         return lesson
 
@@ -129,14 +140,14 @@ class AdminContentService:
         if not lesson:
             return False
         await self.db.delete(lesson)
-        await self.db.commit()
+        await self._commit()
         return True
 
     # Challenge CRUD
     async def create_challenge(self, challenge_in: ChallengeCreate) -> Challenge:
         challenge = Challenge(**challenge_in.model_dump())
         self.db.add(challenge)
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(challenge)
         return challenge
 
@@ -155,7 +166,7 @@ class AdminContentService:
             setattr(challenge, field, value)
         
         self.db.add(challenge)
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(challenge)
         return challenge
 
@@ -165,14 +176,14 @@ class AdminContentService:
         if not challenge:
             return False
         await self.db.delete(challenge)
-        await self.db.commit()
+        await self._commit()
         return True
 
     # Challenge Option CRUD
     async def create_challenge_option(self, option_in: ChallengeOptionCreate, challenge_id: int) -> ChallengeOption:
         option = ChallengeOption(challenge_id=challenge_id, **option_in.model_dump())
         self.db.add(option)
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(option)
         return option
 
@@ -187,7 +198,7 @@ class AdminContentService:
             setattr(option, field, value)
         
         self.db.add(option)
-        await self.db.commit()
+        await self._commit()
         await self.db.refresh(option)
         return option
 
@@ -197,5 +208,5 @@ class AdminContentService:
         if not option:
             return False
         await self.db.delete(option)
-        await self.db.commit()
+        await self._commit()
         return True
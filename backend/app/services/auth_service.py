@@ -2,9 +2,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.user import User
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash, verify_password, create_access_token, create_refresh_token
+from app.services.user_cache import user_cache
+from app.core.security import password_hasher, create_access_token, create_refresh_token
+from app.core.log import get_logger
 from fastapi import HTTPException, status
 
+logger = get_logger(__name__)
+
 class AuthService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -17,7 +21,7 @@ class AuthService:
         user = await self.get_user_by_email(email)
         if not user or not user.hashed_password:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await password_hasher.verify(password, user.hashed_password):
             return None
             
         # Special case: Ensure the default admin user always has admin privileges
@@ -25,6 +29,7 @@ class AuthService:
             user.is_admin = True
             self.db.add(user)
             await self.db.commit()
+            user_cache.invalidate(user.id)
             await self.db.refresh(user)
             
         return user
@@ -37,7 +42,7 @@ class AuthService:
                 detail="Email already registered"
             )
         
-        hashed_password = get_password_hash(user_in.password)
+        hashed_password = await password_hasher.hash(user_in.password)
         db_user = User(
             email=user_in.email,
             hashed_password=hashed_password,
@@ -50,6 +55,7 @@ class AuthService:
         self.db.add(db_user)
         await self.db.commit()
         await self.db.refresh(db_user)
+        logger.info("User registered", extra={"user_id": db_user.id})
         return db_user
 
     async def authenticate_google(self, email: str, google_id: str, full_name: str, image_src: str) -> User:
@@ -78,6 +84,7 @@ class AuthService:
                     user.image_src = image_src
                 self.db.add(user)
                 await self.db.commit()
+                user_cache.invalidate(user.id)
                 await self.db.refresh(user)
             return user
 
@@ -127,6 +134,7 @@ class AuthService:
             if should_update:
                 self.db.add(user)
                 await self.db.commit()
+                user_cache.invalidate(user.id)
                 await self.db.refresh(user)
             
             return user
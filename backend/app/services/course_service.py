@@ -1,121 +1,298 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from app.models.course import Course, Unit, Lesson, Challenge
-from app.models.progress import UserProgress
-from typing import List, Optional
+from sqlalchemy import select, func, and_, not_, true, false, cast, Text, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from app.models.course import Course as CourseModel, Unit, Lesson as LessonModel, Challenge, ChallengeOption
+from app.models.progress import UserProgress, UserUnitProgress, UserCourseProgress
+from app.schemas.course import CourseList
+from app.services.curriculum_cache import CourseNode, CurriculumSnapshot, LessonNode, curriculum_cache
+from typing import Dict, List, Optional
+
+_EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+
+def _json_array(element, *order_by, where):
+    """Correlated ``json_agg`` of ``element`` as a scalar subquery, ``[]`` when empty."""
+    return (
+        select(func.coalesce(func.json_agg(aggregate_order_by(element, *order_by)), _EMPTY_JSON_ARRAY))
+        .where(where)
+        .scalar_subquery()
+    )
+
+
+def _course_units_json():
+    """Postgres expression for a course's ``units`` array, shaped like ``schemas.course.Unit``.
+
+    Flag fields carry the schema defaults, matching the anonymous responses.
+    """
+    options = _json_array(
+        func.json_build_object(
+            "text", ChallengeOption.text,
+            "correct", ChallengeOption.correct,
+            "image_src", ChallengeOption.image_src,
+            "audio_src", ChallengeOption.audio_src,
+            "id", ChallengeOption.id,
+        ),
+        ChallengeOption.id,
+        where=ChallengeOption.challenge_id == Challenge.id,
+    )
+    challenges = _json_array(
+        func.json_build_object(
+            "type", Challenge.type,
+            "question", Challenge.question,
+            "correct_text", Challenge.correct_text,
+            "audio_src", Challenge.audio_src,
+            "order_index", Challenge.order_index,
+            "id", Challenge.id,
+            "options", options,
+        ),
+        Challenge.order_index, Challenge.id,
+        where=Challenge.lesson_id == LessonModel.id,
+    )
+    lessons = _json_array(
+        func.json_build_object(
+            "title", LessonModel.title,
+            "order_index", LessonModel.order_index,
+            "id", LessonModel.id,
+            "challenges", challenges,
+            "completed", false(),
+        ),
+        LessonModel.order_index, LessonModel.id,
+        where=LessonModel.unit_id == Unit.id,
+    )
+    return _json_array(
+        func.json_build_object(
+            "title", Unit.title,
+            "description", Unit.description,
+            "order_index", Unit.order_index,
+            "id", Unit.id,
+            "lessons", lessons,
+            "locked", true(),
+            "completed", false(),
+        ),
+        Unit.order_index, Unit.id,
+        where=Unit.course_id == CourseModel.id,
+    )
+
 
 class CourseService:
-    def __init__(self, db: AsyncSession):
+    """Curriculum reads, served from the shared in-process snapshot.
+
+    Returned nodes are immutable tuples from the snapshot, or per-call copies of
+    them carrying the user's lock/completion flags. Content is loaded through ``read_db`` (the replica when
+    one is configured); per-user progress always comes from ``db``.
+    """
+
+    def __init__(self, db: AsyncSession, read_db: Optional[AsyncSession] = None):
         self.db = db
+        self.read_db = read_db or db
+
+    async def get_snapshot(self) -> CurriculumSnapshot:
+        return await curriculum_cache.get(self.read_db)
 
-    async def get_courses(self, user_id: Optional[int] = None) -> List[Course]:
+    async def _get_course_completion_counts(self, user_id: int) -> Dict[int, int]:
         result = await self.db.execute(
-            select(Course).order_by(Course.order_index).options(
-                selectinload(Course.units)
-                .selectinload(Unit.lessons)
-                .selectinload(Lesson.challenges)
-                .selectinload(Challenge.options)
-            )
+            select(UserCourseProgress.course_id, UserCourseProgress.completed_lessons)
+            .where(UserCourseProgress.user_id == user_id)
         )
-        courses = list(result.scalars().all())
-        
-        if not user_id:
-            # For anonymous users, first course is unlocked, others locked
-            for i, course in enumerate(courses):
-                course.locked = i > 0
-                course.completed = False
-            return courses
+        return dict(result.all())
 
-        # Fetch all completed lesson IDs for the user
+    async def _get_unit_completion_counts(self, user_id: int, unit_ids: List[int]) -> Dict[int, int]:
+        result = await self.db.execute(
+            select(UserUnitProgress.unit_id, UserUnitProgress.completed_lessons)
+            .where(UserUnitProgress.user_id == user_id, UserUnitProgress.unit_id.in_(unit_ids))
+        )
+        return dict(result.all())
+
+    async def _get_completed_lesson_ids(self, user_id: int, lesson_ids: List[int]) -> set[int]:
         progress_result = await self.db.execute(
             select(UserProgress.lesson_id).where(
                 UserProgress.user_id == user_id,
+                UserProgress.lesson_id.in_(lesson_ids),
                 UserProgress.completed == True
             )
         )
-        completed_lesson_ids = set(progress_result.scalars().all())
+        return set(progress_result.scalars().all())
+
+    async def get_courses(self, user_id: Optional[int] = None) -> List[CourseNode]:
+        snapshot = await self.get_snapshot()
+
+        if not user_id:
+            # For anonymous users, first course is unlocked, others locked
+            return [
+                course._replace(locked=i > 0, completed=False)
+                for i, course in enumerate(snapshot.courses)
+            ]
+
+        # Completed-lesson counts per course, from the summary table
+        completed_counts = await self._get_course_completion_counts(user_id)
 
         # Determine completion and locking for each course
+        courses = []
         previous_course_completed = True # First course is always unlocked
-        for course in courses:
+        for course in snapshot.courses:
             # A course is completed if all its lessons are completed
-            course_all_lessons = [l.id for u in course.units for l in u.lessons]
-            if not course_all_lessons:
+            lesson_count = len(snapshot.course_lesson_ids[course.id])
+            if not lesson_count:
                 # If a course has no lessons, consider it completed if it's not the first one?
                 # Actually, let's say it's completed if it exists.
-                course.completed = True
+                completed = True
             else:
-                course.completed = all(lid in completed_lesson_ids for lid in course_all_lessons)
-            
+                completed = completed_counts.get(course.id, 0) >= lesson_count
+
             # A course is locked if the previous course was NOT completed
-            course.locked = not previous_course_completed
-            
+            courses.append(course._replace(locked=not previous_course_completed, completed=completed))
+
             # Prepare for next iteration
-            previous_course_completed = course.completed
+            previous_course_completed = completed
 
         return courses
 
-    async def get_course(self, course_id: int) -> Course | None:
-        result = await self.db.execute(
-            select(Course)
-            .where(Course.id == course_id)
-            .options(
-                selectinload(Course.units)
-                .selectinload(Unit.lessons)
-                .selectinload(Lesson.challenges)
-                .selectinload(Challenge.options)
-            )
-        )
-        return result.scalars().first()
+    async def get_course(self, course_id: int) -> CourseNode | None:
+        snapshot = await self.get_snapshot()
+        return snapshot.courses_by_id.get(course_id)
 
-    async def get_course_with_progress(self, course_id: int, user_id: Optional[int] = None) -> Course | None:
+    async def get_course_with_progress(self, course_id: int, user_id: Optional[int] = None) -> CourseNode | None:
         course = await self.get_course(course_id)
         if not course:
             return None
-        
+
         if not user_id:
             return course
 
-        # Fetch all completed lesson IDs for the user
-        progress_result = await self.db.execute(
-            select(UserProgress.lesson_id).where(
-                UserProgress.user_id == user_id,
-                UserProgress.completed == True
-            )
+        # Completed-lesson counts per unit; lesson-level flags are only looked up
+        # for units that are partially done.
+        unit_counts = await self._get_unit_completion_counts(user_id, [unit.id for unit in course.units])
+        partial_lesson_ids = [
+            lesson.id
+            for unit in course.units
+            if 0 < unit_counts.get(unit.id, 0) < len(unit.lessons)
+            for lesson in unit.lessons
+        ]
+        completed_lesson_ids = (
+            await self._get_completed_lesson_ids(user_id, partial_lesson_ids) if partial_lesson_ids else set()
         )
-        completed_lesson_ids = set(progress_result.scalars().all())
-
-        # Sort units by order_index just in case
-        course.units.sort(key=lambda x: x.order_index)
 
-        # Overlay progress and determine unit locking
+        # Overlay progress and determine unit locking (units are already ordered)
+        units = []
         previous_unit_completed = True # First unit is always unlocked
         for unit in course.units:
-            unit_lessons_count = len(unit.lessons)
-            completed_unit_lessons = 0
-            
-            for lesson in unit.lessons:
-                lesson.completed = lesson.id in completed_lesson_ids
-                if lesson.completed:
-                    completed_unit_lessons += 1
-            
+            completed_unit_lessons = unit_counts.get(unit.id, 0)
+
             # Unit completion: all lessons are completed
-            unit.completed = unit_lessons_count > 0 and completed_unit_lessons == unit_lessons_count
-            
+            unit_completed = len(unit.lessons) > 0 and completed_unit_lessons >= len(unit.lessons)
+
+            if unit_completed:
+                lessons = tuple(lesson._replace(completed=True) for lesson in unit.lessons)
+            elif completed_unit_lessons:
+                lessons = tuple(
+                    lesson._replace(completed=lesson.id in completed_lesson_ids)
+                    for lesson in unit.lessons
+                )
+            else:
+                # Snapshot lessons already default to not completed
+                lessons = unit.lessons
+
             # Unit locking: previous unit must be completed
-            unit.locked = not previous_unit_completed
-            
+            units.append(unit._replace(
+                lessons=lessons,
+                locked=not previous_unit_completed,
+                completed=unit_completed,
+            ))
+
             # Pass forward for next unit
-            previous_unit_completed = unit.completed
-        
-        return course
+            previous_unit_completed = unit_completed
+
+        return course._replace(units=tuple(units))
 
-    async def get_lesson(self, lesson_id: int) -> Lesson | None:
+    async def get_lesson(self, lesson_id: int) -> LessonNode | None:
+        snapshot = await self.get_snapshot()
+        return snapshot.lessons_by_id.get(lesson_id)
+
+    async def get_course_catalog(self, user_id: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[CourseList]:
+        """Flat, paginated course listing with lock/completion computed in SQL.
+
+        Only course columns are selected; the lesson tree is never loaded.
+        """
+        ordering = (CourseModel.order_index, CourseModel.id)
+
+        if not user_id:
+            # Same rule as get_courses: only the first course is open to anonymous users
+            completed = false()
+            locked = func.row_number().over(order_by=ordering) > 1
+            catalog = select(
+                CourseModel.id,
+                CourseModel.title,
+                CourseModel.description,
+                CourseModel.image_src,
+                CourseModel.order_index,
+                locked.label("locked"),
+                completed.label("completed"),
+            )
+        else:
+            lesson_counts = (
+                select(Unit.course_id, func.count(LessonModel.id).label("lesson_count"))
+                .join(LessonModel, LessonModel.unit_id == Unit.id)
+                .group_by(Unit.course_id)
+                .subquery()
+            )
+            # Courses without lessons count as completed, as in get_courses
+            completed = (
+                func.coalesce(UserCourseProgress.completed_lessons, 0)
+                >= func.coalesce(lesson_counts.c.lesson_count, 0)
+            )
+            # A course is locked unless the previous one is completed; the first never is
+            locked = not_(func.lag(completed, 1, true()).over(order_by=ordering))
+            catalog = (
+                select(
+                    CourseModel.id,
+                    CourseModel.title,
+                    CourseModel.description,
+                    CourseModel.image_src,
+                    CourseModel.order_index,
+                    locked.label("locked"),
+                    completed.label("completed"),
+                )
+                .outerjoin(lesson_counts, lesson_counts.c.course_id == CourseModel.id)
+                .outerjoin(
+                    UserCourseProgress,
+                    and_(UserCourseProgress.course_id == CourseModel.id, UserCourseProgress.user_id == user_id),
+                )
+            )
+
+        # Paginate after the window so locking still sees the previous course
+        catalog = catalog.subquery()
         result = await self.db.execute(
-            select(Lesson)
-            .where(Lesson.id == lesson_id)
-            .options(selectinload(Lesson.challenges).selectinload(Challenge.options))
+            select(catalog)
+            .order_by(catalog.c.order_index, catalog.c.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return [CourseList(**row._mapping) for row in result]
+
+    async def get_course_json(self, course_id: int) -> bytes | None:
+        """Encoded anonymous course document, built entirely in Postgres.
+
+        One round-trip and no ORM or pydantic objects; used to fill the response
+        cache when ``COURSE_JSON_AGGREGATION`` is enabled.
+        """
+        document = func.json_build_object(
+            "title", CourseModel.title,
+            "description", CourseModel.description,
+            "image_src", CourseModel.image_src,
+            "order_index", CourseModel.order_index,
+            "id", CourseModel.id,
+            "units", _course_units_json(),
+            "locked", false(),
+            "completed", false(),
         )
-        return result.scalars().first()
+        result = await self.read_db.execute(select(cast(document, Text)).where(CourseModel.id == course_id))
+        raw = result.scalar()
+        return raw.encode() if raw is not None else None
 
+    async def get_course_units_json(self, course_id: int) -> bytes | None:
+        """Encoded ``units`` array of a course, built entirely in Postgres."""
+        result = await self.read_db.execute(
+            select(cast(_course_units_json(), Text)).where(CourseModel.id == course_id)
+        )
+        raw = result.scalar()
+        return raw.encode() if raw is not None else None
@@ -0,0 +1,211 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.log import get_logger
+from app.models.course import Course, Unit, Lesson, Challenge, ChallengeOption
+
+logger = get_logger(__name__)
+
+
+class OptionNode(NamedTuple):
+    id: int
+    text: str
+    correct: bool
+    image_src: Optional[str]
+    audio_src: Optional[str]
+
+
+class ChallengeNode(NamedTuple):
+    id: int
+    type: str
+    question: str
+    correct_text: Optional[str]
+    audio_src: Optional[str]
+    order_index: int
+    options: Tuple[OptionNode, ...] = ()
+
+
+class LessonNode(NamedTuple):
+    id: int
+    title: str
+    order_index: int
+    challenges: Tuple[ChallengeNode, ...] = ()
+    completed: bool = False
+
+
+class UnitNode(NamedTuple):
+    id: int
+    title: str
+    description: Optional[str]
+    order_index: int
+    lessons: Tuple[LessonNode, ...] = ()
+    locked: bool = True
+    completed: bool = False
+
+
+class CourseNode(NamedTuple):
+    id: int
+    title: str
+    description: Optional[str]
+    image_src: Optional[str]
+    order_index: int
+    units: Tuple[UnitNode, ...] = ()
+    locked: bool = False
+    completed: bool = False
+
+
+class CurriculumSnapshot:
+    """Read-only copy of the whole course tree at one content version.
+
+    Nodes are plain tuples with the same field names as ``schemas.course``, so
+    they validate into the response schemas with ``from_attributes``. Being
+    immutable they can be shared between requests; per-user overlays are built
+    with ``_replace``.
+    """
+
+    def __init__(self, version: int, courses: Tuple[CourseNode, ...]):
+        self.version = version
+        self.courses = courses
+        self.courses_by_id: Dict[int, CourseNode] = {course.id: course for course in self.courses}
+        self.lessons_by_id: Dict[int, LessonNode] = {
+            lesson.id: lesson
+            for course in self.courses
+            for unit in course.units
+            for lesson in unit.lessons
+        }
+        self.course_lesson_ids: Dict[int, FrozenSet[int]] = {
+            course.id: frozenset(lesson.id for unit in course.units for lesson in unit.lessons)
+            for course in self.courses
+        }
+
+
+def encode_nodes(adapter: TypeAdapter, nodes) -> bytes:
+    """JSON-encode snapshot nodes as the response schema ``adapter`` describes."""
+    return adapter.dump_json(adapter.validate_python(nodes, from_attributes=True))
+
+
+async def _load_snapshot(db: AsyncSession, version: int) -> CurriculumSnapshot:
+    """Build the tree bottom-up from one column-only query per table.
+
+    Rows arrive sorted within each parent, so grouping them by parent id keeps
+    the (order_index, id) order without sorting in Python.
+    """
+    options = defaultdict(list)
+    result = await db.execute(
+        select(
+            ChallengeOption.challenge_id,
+            ChallengeOption.id,
+            ChallengeOption.text,
+            ChallengeOption.correct,
+            ChallengeOption.image_src,
+            ChallengeOption.audio_src,
+        ).order_by(ChallengeOption.challenge_id, ChallengeOption.id)
+    )
+    for challenge_id, *row in result:
+        options[challenge_id].append(OptionNode(*row))
+
+    challenges = defaultdict(list)
+    result = await db.execute(
+        select(
+            Challenge.lesson_id,
+            Challenge.id,
+            Challenge.type,
+            Challenge.question,
+            Challenge.correct_text,
+            Challenge.audio_src,
+            Challenge.order_index,
+        ).order_by(Challenge.lesson_id, Challenge.order_index, Challenge.id)
+    )
+    for lesson_id, *row in result:
+        challenges[lesson_id].append(ChallengeNode(*row, tuple(options.get(row[0], ()))))
+
+    lessons = defaultdict(list)
+    result = await db.execute(
+        select(Lesson.unit_id, Lesson.id, Lesson.title, Lesson.order_index)
+        .order_by(Lesson.unit_id, Lesson.order_index, Lesson.id)
+    )
+    for unit_id, *row in result:
+        lessons[unit_id].append(LessonNode(*row, tuple(challenges.get(row[0], ()))))
+
+    units = defaultdict(list)
+    result = await db.execute(
+        select(Unit.course_id, Unit.id, Unit.title, Unit.description, Unit.order_index)
+        .order_by(Unit.course_id, Unit.order_index, Unit.id)
+    )
+    for course_id, *row in result:
+        units[course_id].append(UnitNode(*row, tuple(lessons.get(row[0], ()))))
+
+    result = await db.execute(
+        select(Course.id, Course.title, Course.description, Course.image_src, Course.order_index)
+        .order_by(Course.order_index, Course.id)
+    )
+    courses = tuple(CourseNode(*row, tuple(units.get(row[0], ()))) for row in result)
+
+    return CurriculumSnapshot(version, courses)
+
+
+class CurriculumCache:
+    """Process-wide cache of the curriculum, invalidated on admin content edits.
+
+    ``invalidate`` only reaches the current worker, so snapshots also expire after
+    ``CURRICULUM_CACHE_TTL_SECONDS`` to pick up edits made through other workers.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self._ttl_seconds = ttl_seconds
+        self._snapshot: Optional[CurriculumSnapshot] = None
+        self._loaded_at = 0.0
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> int:
+        self._expire_if_stale()
+        return self._version
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._snapshot = None
+
+    def _expire_if_stale(self) -> None:
+        if self._snapshot is not None and time.monotonic() - self._loaded_at >= self._ttl_seconds:
+            self.invalidate()
+
+    async def get(self, db: AsyncSession) -> CurriculumSnapshot:
+        self._expire_if_stale()
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None:
+                return snapshot
+
+            version = self._version
+            started = time.perf_counter()
+            snapshot = await _load_snapshot(db, version)
+            logger.info(
+                "Loaded curriculum snapshot",
+                extra={
+                    "version": version,
+                    "lessons": len(snapshot.lessons_by_id),
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                },
+            )
+            # An edit committed while we were loading makes this snapshot stale;
+            # serve it to the caller but do not publish it.
+            if version == self._version:
+                self._snapshot = snapshot
+                self._loaded_at = time.monotonic()
+            return snapshot
+
+
+curriculum_cache = CurriculumCache(settings.CURRICULUM_CACHE_TTL_SECONDS)
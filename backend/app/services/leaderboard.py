@@ -0,0 +1,241 @@
+import asyncio
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.log import get_logger
+from app.db.database import ReadSessionLocal
+from app.models.user import User
+
+logger = get_logger(__name__)
+
+_ID_BITS = 32
+_ID_MASK = (1 << _ID_BITS) - 1
+
+
+def _key(user_id: int, xp: int) -> int:
+    # Orders by xp descending, then id ascending; one int per user keeps
+    # the ranking at a few dozen bytes per entry.
+    return (-xp << _ID_BITS) | user_id
+
+
+def _unpack(key: int) -> Tuple[int, int]:
+    return key & _ID_MASK, -(key >> _ID_BITS)
+
+
+class RankedKeys:
+    """Sorted multiset of ints with O(log n) rank and positional access.
+
+    Keys live in sorted buckets of at most ``2 * load`` items, so an insert or
+    delete only shifts one bucket. A Fenwick tree over the bucket sizes turns a
+    position into (bucket, offset) and back in O(log buckets); it is rebuilt
+    when a bucket is split or emptied.
+    """
+
+    def __init__(self, keys: Iterable[int] = (), load: int = 1000):
+        self._load = load
+        ordered = sorted(keys)
+        self._buckets: List[List[int]] = [ordered[i:i + load] for i in range(0, len(ordered), load)]
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._len = sum(len(bucket) for bucket in self._buckets)
+        tree = [0] * (len(self._buckets) + 1)
+        for index, bucket in enumerate(self._buckets, 1):
+            tree[index] += len(bucket)
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self._tree = tree
+
+    def _add(self, bucket: int, delta: int) -> None:
+        index = bucket + 1
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def _before(self, bucket: int) -> int:
+        """Number of keys in buckets before ``bucket``."""
+        total = 0
+        index = bucket
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+    def _locate(self, position: int) -> Tuple[int, int]:
+        """(bucket, offset) of the key at 0-based ``position``."""
+        bucket = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            candidate = bucket + step
+            if candidate < len(self._tree) and self._tree[candidate] <= position:
+                bucket = candidate
+                position -= self._tree[candidate]
+            step >>= 1
+        return bucket, position
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, key: int) -> None:
+        if not self._buckets:
+            self._buckets.append([key])
+            self._rebuild()
+            return
+        bucket = min(bisect_left(self._maxes, key), len(self._buckets) - 1)
+        keys = self._buckets[bucket]
+        insort(keys, key)
+        self._maxes[bucket] = keys[-1]
+        self._len += 1
+        if len(keys) > 2 * self._load:
+            self._buckets[bucket:bucket + 1] = [keys[:self._load], keys[self._load:]]
+            self._rebuild()
+        else:
+            self._add(bucket, 1)
+
+    def remove(self, key: int) -> None:
+        bucket = bisect_left(self._maxes, key)
+        keys = self._buckets[bucket] if bucket < len(self._buckets) else []
+        offset = bisect_left(keys, key)
+        if offset == len(keys) or keys[offset] != key:
+            raise KeyError(key)
+        del keys[offset]
+        self._len -= 1
+        if keys:
+            self._maxes[bucket] = keys[-1]
+            self._add(bucket, -1)
+        else:
+            del self._buckets[bucket]
+            self._rebuild()
+
+    def index(self, key: int) -> int:
+        """Number of keys smaller than ``key``."""
+        bucket = bisect_left(self._maxes, key)
+        if bucket == len(self._buckets):
+            return self._len
+        return self._before(bucket) + bisect_left(self._buckets[bucket], key)
+
+    def slice(self, start: int, stop: int) -> List[int]:
+        start, stop = max(start, 0), min(stop, self._len)
+        if start >= stop:
+            return []
+        bucket, offset = self._locate(start)
+        result: List[int] = []
+        while len(result) < stop - start:
+            result.extend(self._buckets[bucket][offset:offset + stop - start - len(result)])
+            bucket, offset = bucket + 1, 0
+        return result
+
+
+class Leaderboard:
+    """Users ranked by XP, held in memory for O(log n) rank lookups.
+
+    ``(xp desc, id)`` keys in a ``RankedKeys`` answer "rank of user" and
+    "top N" without touching the users table. ``update`` moves a user after an
+    XP change committed by this worker; the whole board is reloaded in the
+    background every ``refresh_seconds`` to pick up changes made through other
+    workers and new users.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self._refresh_seconds = refresh_seconds
+        self._keys = RankedKeys()
+        self._xp: Dict[int, int] = {}
+        self._loaded_at: Optional[float] = None
+        # Updates made while a reload is reading the table, replayed onto it
+        self._pending: Optional[Dict[int, int]] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    async def load(self, db: AsyncSession) -> None:
+        async with self._lock:
+            await self._load(db)
+
+    async def _load(self, db: AsyncSession) -> None:
+        started = time.perf_counter()
+        self._pending = {}
+        try:
+            result = await db.stream(select(User.id, User.xp))
+            xp_by_id = {user_id: xp async for user_id, xp in result}
+        finally:
+            pending, self._pending = self._pending, None
+        xp_by_id.update(pending)
+        self._replace(xp_by_id)
+        logger.info(
+            "Loaded leaderboard",
+            extra={"users": len(self._keys), "duration_ms": round((time.perf_counter() - started) * 1000, 1)},
+        )
+
+    def _replace(self, xp_by_id: Dict[int, int]) -> None:
+        self._keys = RankedKeys(_key(user_id, xp) for user_id, xp in xp_by_id.items())
+        self._xp = xp_by_id
+        self._loaded_at = time.monotonic()
+
+    async def _reload(self) -> None:
+        try:
+            async with ReadSessionLocal() as db:
+                await self.load(db)
+        except Exception:
+            logger.exception("Leaderboard reload failed, keeping the current ranking")
+            self._loaded_at = time.monotonic()
+
+    async def ensure_loaded(self) -> None:
+        """Load on first use; afterwards schedule a background reload when stale."""
+        if self._loaded_at is None:
+            async with self._lock:
+                # Requests that queued behind the first load reuse its result
+                if self._loaded_at is None:
+                    async with ReadSessionLocal() as db:
+                        await self._load(db)
+        elif time.monotonic() - self._loaded_at >= self._refresh_seconds:
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self._reload())
+
+    def update(self, user_id: int, xp: int) -> None:
+        if self._pending is not None:
+            self._pending[user_id] = xp
+        elif self._loaded_at is None:
+            # Not in use yet; the first load reads the committed value
+            return
+
+        old_xp = self._xp.get(user_id)
+        if old_xp == xp:
+            return
+        if old_xp is not None:
+            self._keys.remove(_key(user_id, old_xp))
+        self._keys.add(_key(user_id, xp))
+        self._xp[user_id] = xp
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """1-based rank, or None if the user is not on the board."""
+        xp = self._xp.get(user_id)
+        if xp is None:
+            return None
+        return self._keys.index(_key(user_id, xp)) + 1
+
+    def xp(self, user_id: int) -> Optional[int]:
+        return self._xp.get(user_id)
+
+    def top(self, limit: int, offset: int = 0) -> List[Tuple[int, int]]:
+        """``(user_id, xp)`` pairs in rank order."""
+        return [_unpack(key) for key in self._keys.slice(offset, offset + limit)]
+
+    def after(self, xp: int, user_id: int, limit: int) -> List[Tuple[int, int]]:
+        """Like ``top``, starting after the ``(xp, user_id)`` cursor."""
+        return self.top(limit, offset=self._keys.index(_key(user_id, xp) + 1))
+
+
+leaderboard = Leaderboard(settings.LEADERBOARD_REFRESH_SECONDS)
@@ -1,8 +1,18 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.models.progress import UserProgress
-from app.models.course import Lesson
+from sqlalchemy import select, literal, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from app.models.progress import UserProgress, UserUnitProgress, UserCourseProgress
+from app.models.course import Lesson, Unit
+from app.core.log import get_logger
+from app.models.user import User
+from app.schemas.progress import LessonCompletion
+from app.services.leaderboard import leaderboard
+from app.services.user_cache import user_cache
+from app.services.user_service import UserService
 from typing import List
+from datetime import datetime
+logger = get_logger(__name__)
+
 
 class ProgressService:
     def __init__(self, db: AsyncSession):
@@ -19,23 +29,102 @@ class ProgressService:
         )
         return result.scalars().first()
 
-    async def mark_lesson_completed(self, user_id: int, lesson_id: int, hearts_used: int, points_earned: int) -> UserProgress:
-        progress = await self.get_lesson_progress(user_id, lesson_id)
-        if progress:
-             progress.completed = True
-             progress.hearts_used = hearts_used
-             progress.points_earned = points_earned
-             # Maybe accumulate points?
-        else:
-            progress = UserProgress(
-                user_id=user_id,
-                lesson_id=lesson_id,
-                completed=True,
-                hearts_used=hearts_used,
-                points_earned=points_earned
+    async def _increment_completion_counts(self, user_id: int, lesson_id: int) -> None:
+        """Bump the unit and course summary counts for a newly completed lesson.
+
+        Runs as a single statement: the unit upsert feeds the course upsert via a CTE.
+        """
+        unit_stmt = insert(UserUnitProgress).from_select(
+            ["user_id", "unit_id", "completed_lessons"],
+            select(literal(user_id), Lesson.unit_id, literal(1)).where(Lesson.id == lesson_id),
+        )
+        unit_row = (
+            unit_stmt.on_conflict_do_update(
+                index_elements=[UserUnitProgress.user_id, UserUnitProgress.unit_id],
+                set_={"completed_lessons": UserUnitProgress.completed_lessons + 1},
+            )
+            .returning(UserUnitProgress.unit_id)
+            .cte("unit_row")
+        )
+        course_stmt = insert(UserCourseProgress).from_select(
+            ["user_id", "course_id", "completed_lessons"],
+            select(literal(user_id), Unit.course_id, literal(1)).join(unit_row, unit_row.c.unit_id == Unit.id),
+        )
+        await self.db.execute(
+            course_stmt.on_conflict_do_update(
+                index_elements=[UserCourseProgress.user_id, UserCourseProgress.course_id],
+                set_={"completed_lessons": UserCourseProgress.completed_lessons + 1},
             )
-            self.db.add(progress)
-        
+        )
+
+    async def mark_lesson_completed(self, user_id: int, lesson_id: int, hearts_used: int, points_earned: int) -> UserProgress:
+        progress = await self._upsert_completion(user_id, lesson_id, hearts_used, points_earned)
         await self.db.commit()
-        await self.db.refresh(progress)
+        return progress
+
+    async def complete_lesson(self, user: User, lesson_id: int, hearts_used: int, points_earned: int) -> LessonCompletion:
+        """Progress upsert, XP/streak update and quest awards in one transaction.
+
+        Issues no refreshes: the progress row comes back from RETURNING and the user
+        row is written by the commit's flush, so the result is built from memory.
+        """
+        progress = await self._upsert_completion(user.id, lesson_id, hearts_used, points_earned)
+        # Hold the user UPDATE back so it is flushed once, together with any
+        # quest rows, at commit instead of before each quest query.
+        with self.db.no_autoflush:
+            awarded_quests = await UserService(self.db).apply_xp(user, points_earned)
+        self.db.add(user)
+        await self.db.commit()
+        user_cache.invalidate(user.id)
+        leaderboard.update(user.id, user.xp)
+        return LessonCompletion(progress=progress, user=user, awarded_quests=awarded_quests)
+
+    async def _upsert_completion(self, user_id: int, lesson_id: int, hearts_used: int, points_earned: int) -> UserProgress:
+        """Record a completion with a single ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING``.
+
+        The unique (user_id, lesson_id) constraint makes concurrent completions of
+        the same lesson converge on one row instead of inserting duplicates.
+        """
+        now = datetime.utcnow()
+        # Evaluated against the statement snapshot, i.e. the row as it was before this upsert
+        previously_completed = (
+            select(UserProgress.completed)
+            .where(UserProgress.user_id == user_id, UserProgress.lesson_id == lesson_id)
+            .scalar_subquery()
+        )
+        stmt = insert(UserProgress).values(
+            user_id=user_id,
+            lesson_id=lesson_id,
+            completed=True,
+            hearts_used=hearts_used,
+            points_earned=points_earned,
+            created_at=now,
+            updated_at=now,
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_user_progress_user_id_lesson_id",
+            set_={
+                "completed": True,
+                "hearts_used": stmt.excluded.hearts_used,
+                "points_earned": stmt.excluded.points_earned,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(
+            UserProgress,
+            # xmax is 0 only for a freshly inserted row version
+            literal_column("xmax = 0").label("inserted"),
+            previously_completed.label("previously_completed"),
+        )
+        result = await self.db.execute(stmt, execution_options={"populate_existing": True})
+        progress, inserted, was_completed = result.one()
+
+        # A losing concurrent insert sees no previous row but did not insert either,
+        # so only the winner counts the completion.
+        if inserted or was_completed is False:
+            await self._increment_completion_counts(user_id, lesson_id)
+        logger.debug(
+            "Lesson completion recorded",
+            extra={"user_id": user_id, "lesson_id": lesson_id, "first_completion": bool(inserted or was_completed is False)},
+        )
+
         return progress
@@ -0,0 +1,66 @@
+import time
+from bisect import bisect_right
+from typing import List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.quest import Quest
+
+
+class QuestEntry(NamedTuple):
+    id: int
+    title: str
+    description: str
+    points: int
+    required_streak: int
+
+
+class QuestCatalog:
+    """All quests, plus their streak thresholds in sorted order for bisection."""
+
+    def __init__(self, quests: Tuple[QuestEntry, ...]):
+        self.quests = quests
+        self._by_threshold = sorted(quests, key=lambda quest: (quest.required_streak, quest.id))
+        self._thresholds = [quest.required_streak for quest in self._by_threshold]
+
+    def crossed(self, old_streak: int, new_streak: int) -> List[QuestEntry]:
+        """Quests whose ``required_streak`` lies in ``(old_streak, new_streak]``."""
+        if new_streak <= old_streak:
+            return []
+        start = bisect_right(self._thresholds, old_streak)
+        stop = bisect_right(self._thresholds, new_streak)
+        return self._by_threshold[start:stop]
+
+
+class QuestCatalogCache:
+    """Process-wide quest catalog.
+
+    Quests are only written by seed and admin scripts, so ``invalidate`` is
+    rarely needed within a worker; the TTL picks up edits made elsewhere.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self._ttl_seconds = ttl_seconds
+        self._catalog: Optional[QuestCatalog] = None
+        self._loaded_at = 0.0
+
+    def invalidate(self) -> None:
+        self._catalog = None
+
+    async def get(self, db: AsyncSession) -> QuestCatalog:
+        catalog = self._catalog
+        if catalog is not None and time.monotonic() - self._loaded_at < self._ttl_seconds:
+            return catalog
+
+        result = await db.execute(
+            select(Quest.id, Quest.title, Quest.description, Quest.points, Quest.required_streak).order_by(Quest.id)
+        )
+        catalog = QuestCatalog(tuple(QuestEntry(*row) for row in result))
+        self._catalog = catalog
+        self._loaded_at = time.monotonic()
+        return catalog
+
+
+quest_catalog = QuestCatalogCache(settings.QUEST_CATALOG_TTL_SECONDS)
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import settings
+from app.models.user import User
+
+_COLUMNS = tuple(attr.key for attr in inspect(User).column_attrs)
+# InstanceState.info flag for users rebuilt from the cache rather than loaded
+_FROM_CACHE = "from_identity_cache"
+
+
+class UserIdentityCache:
+    """Bounded, short-lived cache of authenticated users' column values by id.
+
+    Lets ``get_current_user`` resolve the token subject without a query. Entries
+    are dropped when this worker modifies the user; the TTL bounds how long a
+    change made through another worker can go unseen. Writers call
+    ``refresh_if_cached`` first so they never build on such stale values.
+
+    Token versions are kept separately and survive invalidation; claims-only
+    auth compares against them. ``sync_token_versions`` re-reads every non-zero
+    ``users.token_version`` (only users whose role ever changed, so the map
+    stays small) at most every ``version_refresh_seconds``, which bounds how
+    long a role change made through another worker goes unseen here.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, version_refresh_seconds: int):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._token_versions: Dict[int, int] = {}
+        self._version_refresh_seconds = version_refresh_seconds
+        self._versions_synced_at: Optional[float] = None
+        self._versions_lock = asyncio.Lock()
+
+    def put(self, user: User) -> None:
+        self.note_token_version(user.id, user.token_version)
+        values = {key: getattr(user, key) for key in _COLUMNS}
+        self._entries[user.id] = (time.monotonic() + self._ttl_seconds, values)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def note_token_version(self, user_id: int, version: int) -> None:
+        if version and version > self._token_versions.get(user_id, 0):
+            self._token_versions[user_id] = version
+
+    def token_version(self, user_id: int) -> int:
+        """Newest token version this worker has seen for the user."""
+        return self._token_versions.get(user_id, 0)
+
+    def _versions_fresh(self) -> bool:
+        synced_at = self._versions_synced_at
+        return synced_at is not None and time.monotonic() - synced_at < self._version_refresh_seconds
+
+    async def sync_token_versions(self, db: AsyncSession) -> None:
+        """Re-read token versions from the users table once they are older than the refresh interval."""
+        if self._versions_fresh():
+            return
+        async with self._versions_lock:
+            # Requests that queued behind a sync reuse its result
+            if self._versions_fresh():
+                return
+            result = await db.execute(select(User.id, User.token_version).where(User.token_version > 0))
+            versions = dict(result.all())
+            for user_id, version in versions.items():
+                if version > self._token_versions.get(user_id, 0):
+                    # Changed through another worker; the cached row is stale too
+                    self.invalidate(user_id)
+            # Keep anything noted by this worker while the query ran
+            for user_id, version in self._token_versions.items():
+                if version > versions.get(user_id, 0):
+                    versions[user_id] = version
+            self._token_versions = versions
+            self._versions_synced_at = time.monotonic()
+
+    def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _get_values(self, user_id: int) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, values = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return values
+
+    async def get_user(self, db: AsyncSession, user_id: int) -> User | None:
+        """The user as a persistent instance of ``db``, loading it only on a miss.
+
+        Cached values are merged without a SELECT, and the session's identity map
+        hands every caller in the same request the same object.
+        """
+        values = self._get_values(user_id)
+        if values is None:
+            user = await db.get(User, user_id)
+            if user is not None:
+                self.put(user)
+            return user
+
+        user = db.identity_map.get(db.identity_key(User, user_id))
+        if user is not None:
+            return user
+
+        detached = User(**values)
+        make_transient_to_detached(detached)
+        user = await db.merge(detached, load=False)
+        inspect(user).info[_FROM_CACHE] = True
+        return user
+
+    async def refresh_if_cached(self, db: AsyncSession, user: User) -> None:
+        """Reload ``user`` from the database if it was served from the cache."""
+        if inspect(user).info.pop(_FROM_CACHE, False):
+            await db.refresh(user)
+
+
+user_cache = UserIdentityCache(
+    settings.USER_CACHE_MAX_ENTRIES, settings.USER_CACHE_TTL_SECONDS, settings.TOKEN_VERSION_REFRESH_SECONDS
+)
@@ -1,9 +1,17 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.user import User
-from app.models.quest import Quest, UserQuest
+from app.models.quest import UserQuest
+from app.core.log import get_logger
 from app.schemas.user import UserUpdate
+from app.services.leaderboard import leaderboard
+from app.services.quest_catalog import QuestEntry, quest_catalog
+from app.services.user_cache import user_cache
+from app.services.xp_ledger_service import XpLedgerService
 from datetime import date, timedelta, datetime
+from typing import List
+logger = get_logger(__name__)
+
 
 class UserService:
     def __init__(self, db: AsyncSession):
@@ -13,7 +21,24 @@ class UserService:
         result = await self.db.execute(select(User).where(User.id == user_id))
         return result.scalars().first()
 
+    async def _save(self, user: User) -> User:
+        """Commit changes to ``user``, drop its cached identity and reload it."""
+        self.db.add(user)
+        await self.db.commit()
+        user_cache.invalidate(user.id)
+        await self.db.refresh(user)
+        return user
+
+    async def set_admin(self, user: User, is_admin: bool) -> User:
+        """Grant or revoke admin rights, making claims in existing tokens stale."""
+        user.is_admin = is_admin
+        user.token_version += 1
+        await self._save(user)
+        user_cache.note_token_version(user.id, user.token_version)
+        return user
+
     async def update_user(self, user: User, user_in: UserUpdate) -> User:
+        await user_cache.refresh_if_cached(self.db, user)
         update_data = user_in.model_dump(exclude_unset=True)
         if "password" in update_data:
             # Password hashing should be handled by service caller or here if needed, 
@@ -25,14 +50,27 @@ class UserService:
         for field, value in update_data.items():
             setattr(user, field, value)
         
-        self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
-        return user
+        return await self._save(user)
 
     async def add_xp(self, user: User, xp: int) -> User:
+        await self.apply_xp(user, xp)
+        
+        user = await self._save(user)
+        leaderboard.update(user.id, user.xp)
+        return user
+
+    async def apply_xp(self, user: User, xp: int) -> List[QuestEntry]:
+        """Apply XP, streak and quest rewards to ``user`` without committing.
+
+        Returns the quests awarded by this change. The caller commits and must
+        invalidate ``user_cache`` for the user and update ``leaderboard``.
+        """
+        await user_cache.refresh_if_cached(self.db, user)
+        previous_streak = user.streak_count
         user.xp += xp
         user.points += xp # Also add points for now
+        if xp:
+            await XpLedgerService(self.db).record(user.id, xp)
 
         
         today = date.today()
@@ -73,30 +111,31 @@ class UserService:
                     user.last_activity_date = today
         
         # Check for streak quests
-        await self._check_streak_quests(user)
-        
-        self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
-        return user
+        return await self._check_streak_quests(user, previous_streak)
+
+    async def _check_streak_quests(self, user: User, previous_streak: int) -> List[QuestEntry]:
+        """Award quests whose streak threshold the user just reached.
+
+        Only thresholds crossed by this change are considered, found by bisecting
+        the cached catalog; a reset counts as starting again from 0. Nothing is
+        queried unless a threshold was crossed.
+        """
+        if user.streak_count < previous_streak:
+            previous_streak = 0
+        catalog = await quest_catalog.get(self.db)
+        candidates = catalog.crossed(previous_streak, user.streak_count)
+        if not candidates:
+            return []
 
-    async def _check_streak_quests(self, user: User):
-        """Check and award quests based on current streak."""
-        # Find quests user hasn't completed yet
-        result = await self.db.execute(
-            select(Quest)
-            .where(Quest.required_streak <= user.streak_count)
-        )
-        eligible_quests = result.scalars().all()
-        
         # Get already completed quest IDs
         completed_result = await self.db.execute(
             select(UserQuest.quest_id)
-            .where(UserQuest.user_id == user.id)
+            .where(UserQuest.user_id == user.id, UserQuest.quest_id.in_([quest.id for quest in candidates]))
         )
         completed_ids = set(completed_result.scalars().all())
         
-        for quest in eligible_quests:
+        awarded = []
+        for quest in candidates:
             if quest.id not in completed_ids:
                 # Award quest
                 user_quest = UserQuest(
@@ -107,18 +146,18 @@ class UserService:
                 )
                 self.db.add(user_quest)
                 user.points += quest.points # Reward points
+                awarded.append(quest)
+                logger.info("Quest awarded", extra={"user_id": user.id, "quest_id": quest.id})
+        return awarded
 
     async def refill_hearts(self, user: User) -> User:
+        await user_cache.refresh_if_cached(self.db, user)
         user.hearts = 5
-        self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
-        return user
+        return await self._save(user)
 
     async def reduce_hearts(self, user: User) -> User:
+        await user_cache.refresh_if_cached(self.db, user)
         if user.hearts > 0:
             user.hearts -= 1
-            self.db.add(user)
-            await self.db.commit()
-            await self.db.refresh(user)
+            await self._save(user)
         return user
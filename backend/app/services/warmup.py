@@ -0,0 +1,89 @@
+"""Startup warmup, run before the app reports ready.
+
+A cold worker otherwise pays for connecting, asyncpg type introspection and
+SQLAlchemy statement compilation on its first requests. ``warm_up`` opens the
+pool's connections concurrently and runs the hot per-request statements once
+on each, so every pooled connection has resolved its types and SQLAlchemy's
+compiled cache is filled, then optionally loads the curriculum snapshot and
+seeds the in-memory leaderboard.
+
+Statements run read-only against a user id that does not exist.
+"""
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.log import get_logger
+from app.db.database import AsyncSessionLocal, ReadSessionLocal, engine, read_engine
+from app.models.user import User
+from app.services.auth_service import AuthService
+from app.services.course_service import CourseService
+from app.services.curriculum_cache import curriculum_cache
+from app.services.leaderboard import leaderboard
+from app.services.progress_service import ProgressService
+from app.services.quest_catalog import quest_catalog
+
+logger = get_logger(__name__)
+
+# Truthy, so the signed-in code paths run, and never a real id
+_NO_USER = -1
+
+
+def _pool_size(engine: AsyncEngine) -> int:
+    pool = engine.sync_engine.pool
+    return pool.size() if isinstance(pool, QueuePool) else 1
+
+
+async def _run_hot_statements(db: AsyncSession) -> None:
+    await db.get(User, _NO_USER)
+    await AuthService(db).get_user_by_email("")
+
+    progress_service = ProgressService(db)
+    await progress_service.get_user_progress(_NO_USER)
+    await progress_service.get_lesson_progress(_NO_USER, _NO_USER)
+
+    course_service = CourseService(db)
+    await course_service._get_course_completion_counts(_NO_USER)
+    await course_service._get_unit_completion_counts(_NO_USER, [_NO_USER])
+    await course_service._get_completed_lesson_ids(_NO_USER, [_NO_USER])
+    await course_service.get_course_catalog(_NO_USER)
+    await quest_catalog.get(db)
+
+
+async def _warm_connection(session_factory: async_sessionmaker, statements: bool) -> None:
+    async with session_factory() as db:
+        if statements:
+            await _run_hot_statements(db)
+        else:
+            await db.connection()
+
+
+async def _fill_pool(engine: AsyncEngine, session_factory: async_sessionmaker, statements: bool) -> None:
+    # Sessions held concurrently check out distinct connections
+    await asyncio.gather(*(_warm_connection(session_factory, statements) for _ in range(_pool_size(engine))))
+
+
+async def warm_up(load_curriculum: bool = True) -> None:
+    started = time.perf_counter()
+    await _fill_pool(engine, AsyncSessionLocal, statements=True)
+    if read_engine is not engine:
+        await _fill_pool(read_engine, ReadSessionLocal, statements=False)
+
+    if load_curriculum:
+        async with ReadSessionLocal() as db:
+            await curriculum_cache.get(db)
+
+    if settings.LEADERBOARD_IN_MEMORY:
+        await leaderboard.ensure_loaded()
+
+    logger.info(
+        "Warmup finished",
+        extra={
+            "pool_size": _pool_size(engine),
+            "curriculum": load_curriculum,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        },
+    )
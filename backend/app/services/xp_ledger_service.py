@@ -0,0 +1,56 @@
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.xp import UserXpDaily, UserXpWeekly, XpEvent
+
+
+def week_start(day: date) -> date:
+    """Monday of the week containing ``day``."""
+    return day - timedelta(days=day.weekday())
+
+
+class XpLedgerService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record(self, user_id: int, amount: int, at: Optional[datetime] = None) -> None:
+        """Append an XP gain to the ledger and add it to the day and week totals.
+
+        Does not commit. Runs as a single statement: the ledger insert feeds both
+        rollup upserts via CTEs. ``ON CONFLICT DO UPDATE`` increments the existing
+        row under its row lock, so concurrent gains for the same user and period
+        add up rather than overwrite each other.
+        """
+        at = at or datetime.utcnow()
+        day = at.date()
+
+        event = (
+            insert(XpEvent)
+            .values(user_id=user_id, amount=amount, created_at=at)
+            .returning(XpEvent.user_id, XpEvent.amount)
+            .cte("event")
+        )
+        daily_stmt = insert(UserXpDaily).from_select(
+            ["user_id", "day", "xp"],
+            select(event.c.user_id, literal(day), event.c.amount),
+        )
+        daily = daily_stmt.on_conflict_do_update(
+            index_elements=[UserXpDaily.user_id, UserXpDaily.day],
+            set_={"xp": UserXpDaily.xp + daily_stmt.excluded.xp},
+        ).cte("daily")
+        weekly_stmt = insert(UserXpWeekly).from_select(
+            ["user_id", "week_start", "xp"],
+            select(event.c.user_id, literal(week_start(day)), event.c.amount),
+        )
+        await self.db.execute(
+            weekly_stmt.on_conflict_do_update(
+                index_elements=[UserXpWeekly.user_id, UserXpWeekly.week_start],
+                set_={"xp": UserXpWeekly.xp + weekly_stmt.excluded.xp},
+            )
+            # Not referenced by the outer statement, so attach it explicitly
+            .add_cte(daily)
+        )
@@ -0,0 +1,176 @@
+"""Check that the hot read queries are served from indexes.
+
+Runs the real statements issued by CourseService, ProgressService, the token
+version sync and the leaderboard endpoints against the configured database,
+then EXPLAINs each of them with sequential scans disabled. A Seq Scan that
+survives ``enable_seqscan = off`` means no usable index exists, so the query
+turns into a full table scan once the table is large. Leaderboard statements
+must also use the index their keyset order was designed for. Works on a
+freshly seeded database; no bulk data needed.
+
+Exits with status 1 when any statement falls back to a sequential scan or
+misses its expected index.
+"""
+import asyncio
+import json
+import os
+import sys
+from contextlib import contextmanager
+from sqlalchemy import event, select, func
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.api.v1.endpoints import leaderboard as leaderboard_endpoints
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal, engine
+from app.models.user import User
+from app.schemas.user import Principal
+from app.services.course_service import CourseService
+from app.services.curriculum_cache import curriculum_cache
+from app.services.leaderboard import leaderboard
+from app.services.progress_service import ProgressService
+from app.services.user_cache import user_cache
+
+# Tables that grow with content or users. Courses and quests are small
+# catalogs that are always read in full.
+CHECKED_TABLES = {
+    "units",
+    "lessons",
+    "challenges",
+    "challenge_options",
+    "users",
+    "user_progress",
+    "user_quests",
+    "user_unit_progress",
+    "user_course_progress",
+}
+
+
+# Index each leaderboard statement is expected to read, by endpoint
+USERS_XP_INDEX = "ix_users_xp_desc_id"
+DAILY_XP_INDEX = "ix_user_xp_daily_day_xp_desc_user_id"
+WEEKLY_XP_INDEX = "ix_user_xp_weekly_week_start_xp_desc_user_id"
+
+
+async def capture_leaderboard_statements(db, user_id, expect):
+    endpoints = leaderboard_endpoints
+    principal = Principal(id=user_id)
+    in_memory = settings.LEADERBOARD_IN_MEMORY
+    try:
+        settings.LEADERBOARD_IN_MEMORY = False
+        with expect(USERS_XP_INDEX):
+            page = await endpoints.get_leaderboard(None, db, limit=10, after=None)
+            if page:
+                await endpoints.get_leaderboard(None, db, limit=10, after=f"{page[-1].xp},{page[-1].id}")
+        # Counts every user ranked above, so it must never touch the heap
+        with expect(USERS_XP_INDEX, index_only=True):
+            await endpoints.get_leaderboard_around_me(principal, db, k=5)
+        with expect(DAILY_XP_INDEX):
+            await endpoints.get_daily_leaderboard(db, limit=10, after=None)
+            await endpoints.get_daily_leaderboard(db, limit=10, after="0,0")
+        with expect(WEEKLY_XP_INDEX):
+            await endpoints.get_weekly_leaderboard(db, limit=10, after=None)
+            await endpoints.get_weekly_leaderboard(db, limit=10, after="0,0")
+
+        # In-memory ranking: the full (id, xp) read it is built from, then
+        # the by-id lookups that serve its pages
+        settings.LEADERBOARD_IN_MEMORY = True
+        await leaderboard.load(db)
+        await endpoints.get_leaderboard(None, db, limit=10, after=None)
+        await endpoints.get_leaderboard_around_me(principal, db, k=5)
+    finally:
+        settings.LEADERBOARD_IN_MEMORY = in_memory
+
+
+async def capture_statements():
+    statements = []
+    expected_index = [None]
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters, expected_index[0]))
+
+    @contextmanager
+    def expect(index_name, index_only=False):
+        expected_index[0] = (index_name, index_only)
+        try:
+            yield
+        finally:
+            expected_index[0] = None
+
+    async with AsyncSessionLocal() as db:
+        user_id = (await db.execute(select(func.min(User.id)))).scalar() or 0
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            # Force a snapshot load so the selectin chain is captured too
+            curriculum_cache.invalidate()
+            course_service = CourseService(db)
+            courses = await course_service.get_courses(user_id)
+            for course in courses[:1]:
+                await course_service.get_course_with_progress(course.id, user_id)
+            await course_service.get_course_catalog(user_id)
+            await ProgressService(db).get_user_progress(user_id)
+            await user_cache.sync_token_versions(db)
+            await capture_leaderboard_statements(db, user_id, expect)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    return statements
+
+
+def seq_scanned_tables(plan):
+    tables = set()
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in CHECKED_TABLES:
+        tables.add(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        tables |= seq_scanned_tables(child)
+    return tables
+
+
+def index_scans(plan):
+    """``(index name, node type)`` of every index scan in the plan."""
+    scans = {(plan["Index Name"], plan["Node Type"])} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        scans |= index_scans(child)
+    return scans
+
+
+def index_problem(plan, index_name, index_only):
+    node_types = {node_type for name, node_type in index_scans(plan) if name == index_name}
+    if not node_types:
+        return f"{index_name} not used"
+    if index_only and node_types != {"Index Only Scan"}:
+        return f"{index_name} read with heap access"
+    return None
+
+
+async def check_query_plans():
+    statements = await capture_statements()
+    failures = 0
+
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("SET enable_seqscan = off")
+        for statement, parameters, expected_index in statements:
+            result = await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            tables = seq_scanned_tables(plan[0]["Plan"])
+            problem = f"seq scan on {', '.join(sorted(tables))}" if tables else None
+            if problem is None and expected_index:
+                problem = index_problem(plan[0]["Plan"], *expected_index)
+
+            summary = " ".join(statement.split())[:100]
+            if problem:
+                failures += 1
+                print(f"FAIL {problem}: {summary}")
+            else:
+                print(f"ok   {summary}")
+
+    print(f"{len(statements)} statements checked, {failures} failed")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(check_query_plans()) else 0)
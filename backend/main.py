@@ -1,12 +1,20 @@
+import asyncio
 import json
+from contextlib import asynccontextmanager
 from urllib.parse import urlsplit
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.core.config import settings
-from app.core.runtime import get_uploads_path, local_uploads_supported
+from app.core.http_client import close_http_client
+from app.core.log import RequestContextMiddleware, get_logger, setup_logging
+from app.core.metrics import render_latest
+from app.core.security import password_hasher
+from app.core.runtime import get_uploads_path, is_running_on_vercel, local_uploads_supported
+from app.db.query_stats import QueryStatsMiddleware
+from app.services.warmup import warm_up
 from app.api.v1.router import api_router
 
 
@@ -52,7 +60,43 @@ def _normalize_origins(origins):
     return normalized
 
 
-app = FastAPI(title=settings.PROJECT_NAME)
+setup_logging(
+    level=settings.LOG_LEVEL,
+    logger_levels=settings.LOG_LEVELS,
+    json_format=settings.LOG_JSON,
+    debug_sample_rate=settings.LOG_DEBUG_SAMPLE_RATE,
+)
+logger = get_logger("app")
+
+
+async def _warm_up(app: FastAPI) -> None:
+    try:
+        await asyncio.wait_for(warm_up(load_curriculum=settings.WARMUP_CURRICULUM), settings.WARMUP_TIMEOUT_SECONDS)
+    except Exception:
+        # Not fatal: everything warmup touches is also loaded lazily
+        logger.exception("Warmup failed, serving cold")
+    finally:
+        app.state.ready = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup_task = None
+    if settings.WARMUP_ON_STARTUP and not is_running_on_vercel():
+        # Runs in the background so liveness answers while readiness waits
+        app.state.ready = False
+        warmup_task = asyncio.create_task(_warm_up(app))
+
+    yield
+
+    if warmup_task is not None:
+        warmup_task.cancel()
+    await close_http_client()
+    password_hasher.shutdown()
+
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+app.state.ready = True
 
 # CORS
 allowed_origins = _normalize_origins(settings.ALLOWED_ORIGINS)
@@ -67,18 +111,41 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.SQL_INSTRUMENTATION:
+    app.add_middleware(
+        QueryStatsMiddleware,
+        statement_budget=settings.SQL_STATEMENT_BUDGET,
+        time_budget_ms=settings.SQL_TIME_BUDGET_MS,
+        repeat_threshold=settings.SQL_REPEAT_THRESHOLD,
+        server_timing=settings.SQL_SERVER_TIMING,
+    )
+app.add_middleware(RequestContextMiddleware)
 
 # API routes
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
+@app.get("/health/live")
+async def health_live():
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
 @app.get("/health")
-async def health():
+async def health_ready():
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"status": "starting"})
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(render_latest(), media_type="text/plain; version=0.0.4")
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
+    logger.exception("Unhandled error on %s %s", request.method, request.url.path)
     return JSONResponse(status_code=500, content={"detail": str(exc)})
 
 
@@ -0,0 +1,155 @@
+"""Report the per-worker memory footprint of the cached curriculum.
+
+Builds a synthetic curriculum (10,000 challenges with four options each by
+default) in each representation and measures it with tracemalloc:
+
+- ORM: mapped instances, as returned by a selectinload chain
+- schemas: pydantic response models
+- nodes: the slotted tuples held by the curriculum snapshot
+
+No database is needed. Usage: python measure_curriculum_memory.py [challenges]
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+# Importing the app creates the engine; it is never connected
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/benchmark")
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.course import Course, Unit, Lesson, Challenge, ChallengeOption
+from app.schemas import course as schemas
+from app.services.curriculum_cache import CourseNode, UnitNode, LessonNode, ChallengeNode, OptionNode
+
+COURSES = 5
+UNITS_PER_COURSE = 10
+CHALLENGES_PER_LESSON = 10
+OPTIONS_PER_CHALLENGE = 4
+
+
+def build_orm(lessons_per_unit):
+    return [
+        Course(
+            id=c, title=f"Course {c}", description="Description", image_src="/course.svg", order_index=c,
+            units=[
+                Unit(
+                    id=u, title=f"Unit {u}", description="Description", order_index=u,
+                    lessons=[
+                        Lesson(
+                            id=l, title=f"Lesson {l}", order_index=l,
+                            challenges=[
+                                Challenge(
+                                    id=h, type="SELECT", question=f"Question {h}", correct_text=None,
+                                    audio_src=None, order_index=h,
+                                    options=[
+                                        ChallengeOption(
+                                            id=o, text=f"Option {o}", correct=o == 0, image_src=None, audio_src=None
+                                        )
+                                        for o in range(OPTIONS_PER_CHALLENGE)
+                                    ],
+                                )
+                                for h in range(CHALLENGES_PER_LESSON)
+                            ],
+                        )
+                        for l in range(lessons_per_unit)
+                    ],
+                )
+                for u in range(UNITS_PER_COURSE)
+            ],
+        )
+        for c in range(COURSES)
+    ]
+
+
+def build_schemas(lessons_per_unit):
+    return [
+        schemas.Course(
+            id=c, title=f"Course {c}", description="Description", image_src="/course.svg", order_index=c,
+            units=[
+                schemas.Unit(
+                    id=u, title=f"Unit {u}", description="Description", order_index=u,
+                    lessons=[
+                        schemas.Lesson(
+                            id=l, title=f"Lesson {l}", order_index=l,
+                            challenges=[
+                                schemas.Challenge(
+                                    id=h, type="SELECT", question=f"Question {h}", correct_text=None,
+                                    audio_src=None, order_index=h,
+                                    options=[
+                                        schemas.ChallengeOption(
+                                            id=o, text=f"Option {o}", correct=o == 0, image_src=None, audio_src=None
+                                        )
+                                        for o in range(OPTIONS_PER_CHALLENGE)
+                                    ],
+                                )
+                                for h in range(CHALLENGES_PER_LESSON)
+                            ],
+                        )
+                        for l in range(lessons_per_unit)
+                    ],
+                )
+                for u in range(UNITS_PER_COURSE)
+            ],
+        )
+        for c in range(COURSES)
+    ]
+
+
+def build_nodes(lessons_per_unit):
+    return tuple(
+        CourseNode(
+            c, f"Course {c}", "Description", "/course.svg", c,
+            tuple(
+                UnitNode(
+                    u, f"Unit {u}", "Description", u,
+                    tuple(
+                        LessonNode(
+                            l, f"Lesson {l}", l,
+                            tuple(
+                                ChallengeNode(
+                                    h, "SELECT", f"Question {h}", None, None, h,
+                                    tuple(
+                                        OptionNode(o, f"Option {o}", o == 0, None, None)
+                                        for o in range(OPTIONS_PER_CHALLENGE)
+                                    ),
+                                )
+                                for h in range(CHALLENGES_PER_LESSON)
+                            ),
+                        )
+                        for l in range(lessons_per_unit)
+                    ),
+                )
+                for u in range(UNITS_PER_COURSE)
+            ),
+        )
+        for c in range(COURSES)
+    )
+
+
+def measure(build, lessons_per_unit):
+    gc.collect()
+    tracemalloc.start()
+    tree = build(lessons_per_unit)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+    return size
+
+
+def main():
+    challenges = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    lessons_per_unit = max(1, challenges // (COURSES * UNITS_PER_COURSE * CHALLENGES_PER_LESSON))
+    total = COURSES * UNITS_PER_COURSE * lessons_per_unit * CHALLENGES_PER_LESSON
+    print(f"{total} challenges, {total * OPTIONS_PER_CHALLENGE} options")
+
+    for name, build in (("ORM", build_orm), ("schemas", build_schemas), ("nodes", build_nodes)):
+        size = measure(build, lessons_per_unit)
+        print(f"{name:<8} {size / 2**20:8.1f} MiB  {size / total:8.0f} B/challenge")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark the in-memory leaderboard at a given number of users.
+
+Seeds a ``Leaderboard`` with random XP values (no database needed) and times
+the operations the API performs: top-N, rank of a user, and moving a user after
+an XP gain. Also reports the memory held by the ranking.
+
+Usage: python measure_leaderboard.py [users] [operations]
+"""
+import os
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+# Importing the app creates the engine; it is never connected
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/benchmark")
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.leaderboard import Leaderboard
+
+
+def report(name: str, seconds: float, operations: int) -> None:
+    print(f"{name:<18} {seconds / operations * 1e6:10.2f} us/op")
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    rng = random.Random(42)
+    xp_by_id = {user_id: int(rng.paretovariate(1.2) * 10) for user_id in range(1, users + 1)}
+
+    board = Leaderboard(refresh_seconds=60)
+    started = time.perf_counter()
+    board._replace(dict(xp_by_id))
+    seed_seconds = time.perf_counter() - started
+
+    # Seeded again under tracemalloc, which slows it down too much to time
+    tracemalloc.start()
+    measured = Leaderboard(refresh_seconds=60)
+    measured._replace(dict(xp_by_id))
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del measured
+    print(f"seed {users:,} users: {seed_seconds * 1000:.1f} ms, {memory / 2**20:.1f} MiB")
+
+    user_ids = [rng.randint(1, users) for _ in range(operations)]
+    report("top 10", timeit.timeit(lambda: board.top(10), number=operations), operations)
+    report("top 100", timeit.timeit(lambda: board.top(100), number=operations), operations)
+    ids = iter(user_ids)
+    report("rank", timeit.timeit(lambda: board.rank(next(ids)), number=operations), operations)
+    ids = iter(user_ids)
+    report("update (+10 xp)", timeit.timeit(lambda: (lambda u: board.update(u, board.xp(u) + 10))(next(ids)), number=operations), operations)
+
+
+if __name__ == "__main__":
+    main()
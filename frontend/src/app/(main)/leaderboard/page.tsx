@@ -97,7 +97,7 @@ export default function LeaderboardPage() {
                     </AvatarFallback>
                   </Avatar>
                   <p className="font-bold text-neutral-800 flex-1">
-                    {item.full_name || item.email}
+                    {item.full_name || "Learner"}
                   </p>
                   <p className="text-muted-foreground">
                     {item.xp} XP
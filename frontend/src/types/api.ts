@@ -156,7 +156,6 @@ export interface QuestProgress extends Quest {
 export interface LeaderboardEntry {
   id: number;
   full_name?: string | null;
-  email: string;
   image_src?: string | null;
   xp: number;
 }